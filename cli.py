@@ -1,132 +1,690 @@
+import hashlib
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from functools import partial
+from pathlib import Path
+from typing import TYPE_CHECKING, Callable
+
 import typer
+from typer.core import TyperGroup
 
 from config import (
-    ChunkingConfig,
-    RepositoryConfig,
+    DEFAULT_CHUNK_SIZE,
+    DEFAULT_EXTENSIONS,
+    DEFAULT_OVERLAP,
+    DEFAULT_REPO_NAME,
+    DEFAULT_REPO_OWNER,
+    EMBEDDING_CACHE_TTL_SECONDS,
+    INDEX_CACHE_TTL_SECONDS,
+    INDEX_CACHE_VERSION,
     SearchType,
     SentenceTransformerModel,
+    get_cache_dir,
+    get_embedding_cache_dir,
+    get_sentence_transformer,
 )
-from core.text_rag import TextRAG
+from output import icon
+
+if TYPE_CHECKING:
+    from core.semantic_cache import SemanticCache
+    from core.text_rag import TextRAG
+    from prompt.models import RAGAnswer
 
 # All errors are now ValueError
 
-app = typer.Typer()
-rag = None
+# Warn when overlap stores each character in more than this many chunks
+MAX_CHUNK_REDUNDANCY = 4
+# Upper bound for concurrent questions in ask-batch, to stay within rate limits
+MAX_BATCH_CONCURRENCY = 5
+
+
+class _AskByDefault(TyperGroup):
+    """Command group that treats `disco "question" ...` as `disco ask ...`"""
+
+    def parse_args(self, ctx, args):
+        # Keep the original single-command invocation working now that
+        # ask-batch and repl exist next to ask
+        group_options = {
+            opt
+            for param in self.get_params(ctx)
+            for opt in (*param.opts, *param.secondary_opts)
+        }
+        if args and args[0] not in self.commands and args[0] not in group_options:
+            args = ["ask", *args]
+        return super().parse_args(ctx, args)
+
+
+app = typer.Typer(cls=_AskByDefault)
+
+
+@dataclass
+class CLIState:
+    """Objects reused across commands run in the same process"""
+
+    rag: "TextRAG | None" = None
+    rag_key: str | None = None
+
+
+# Parameters shared by all commands
+CHUNK_SIZE_ARGUMENT = typer.Argument(
+    DEFAULT_CHUNK_SIZE, help="Size of document chunks in characters"
+)
+OVERLAP_ARGUMENT = typer.Argument(
+    DEFAULT_OVERLAP,
+    help="Overlap ratio between chunks (0.0-1.0)",
+)
+SEARCH_TYPE_OPTION = typer.Option(
+    SearchType.TEXT,
+    "--search-type",
+    "-s",
+    help="Search type: text, vector_minsearch, vector_sentence_transformers, hybrid",
+)
+MODEL_OPTION = typer.Option(
+    SentenceTransformerModel.ALL_MINILM_L6_V2,
+    "--model",
+    "-m",
+    help="SentenceTransformer model name (only for vector_sentence_transformers)",
+)
+OWNER_OPTION = typer.Option(
+    DEFAULT_REPO_OWNER,
+    "--owner",
+    "-o",
+    help="GitHub repository owner",
+)
+REPO_OPTION = typer.Option(
+    DEFAULT_REPO_NAME,
+    "--repo",
+    "-r",
+    help="GitHub repository name",
+)
+EXTENSIONS_OPTION = typer.Option(
+    ",".join(sorted(DEFAULT_EXTENSIONS)),
+    "--extensions",
+    "-e",
+    help="Comma-separated file extensions to include (e.g., md,mdx)",
+)
+SEMANTIC_CACHE_OPTION = typer.Option(
+    False,
+    "--semantic-cache",
+    help="Reuse answers to semantically equivalent earlier questions",
+)
+FALLBACK_OPTION = typer.Option(
+    False,
+    "--fallback",
+    help="Retry with a plain-text prompt when the structured answer fails",
+)
+NO_CACHE_OPTION = typer.Option(
+    False,
+    "--no-cache",
+    help="Ignore the on-disk index cache and re-download the repository",
+)
+VERBOSE_OPTION = typer.Option(False, "--verbose", "-v", help="Enable verbose output")
+
+
+@app.callback()
+def main(ctx: typer.Context):
+    """Ask questions about GitHub repository documentation using RAG"""
+    # Embedders of the app may pass app(obj=CLIState()) to keep the loaded
+    # index across invocations; otherwise each run starts empty
+    if ctx.obj is None:
+        ctx.obj = CLIState()
 
 
 @app.command()
-def main(
+def ask(
+    ctx: typer.Context,
     question: str = typer.Argument(..., help="Question to ask"),
-    chunk_size: int = typer.Argument(
-        ChunkingConfig.DEFAULT_SIZE.value, help="Size of document chunks in characters"
-    ),
-    overlap: float = typer.Argument(
-        ChunkingConfig.DEFAULT_OVERLAP.value,
-        help="Overlap ratio between chunks (0.0-1.0)",
-    ),
-    search_type: str = typer.Option(
-        SearchType.TEXT,
-        "--search-type",
-        "-s",
-        help="Search type: text, vector_minsearch, vector_sentence_transformers",
-    ),
-    model_name: str = typer.Option(
-        SentenceTransformerModel.ALL_MINILM_L6_V2,
-        "--model",
-        "-m",
-        help="SentenceTransformer model name (only for vector_sentence_transformers)",
-    ),
-    repo_owner: str = typer.Option(
-        RepositoryConfig.DEFAULT_OWNER.value,
-        "--owner",
-        "-o",
-        help="GitHub repository owner",
-    ),
-    repo_name: str = typer.Option(
-        RepositoryConfig.DEFAULT_NAME.value,
-        "--repo",
-        "-r",
-        help="GitHub repository name",
-    ),
-    extensions: str = typer.Option(
-        ",".join(RepositoryConfig.DEFAULT_EXTENSIONS.value),
-        "--extensions",
-        "-e",
-        help="Comma-separated file extensions to include (e.g., md,mdx)",
-    ),
-    verbose: bool = typer.Option(
-        False, "--verbose", "-v", help="Enable verbose output"
-    ),
+    chunk_size: int = CHUNK_SIZE_ARGUMENT,
+    overlap: float = OVERLAP_ARGUMENT,
+    search_type: str = SEARCH_TYPE_OPTION,
+    model_name: str = MODEL_OPTION,
+    repo_owner: str = OWNER_OPTION,
+    repo_name: str = REPO_OPTION,
+    extensions: str = EXTENSIONS_OPTION,
+    semantic_cache: bool = SEMANTIC_CACHE_OPTION,
+    fallback: bool = FALLBACK_OPTION,
+    no_cache: bool = NO_CACHE_OPTION,
+    verbose: bool = VERBOSE_OPTION,
 ):
     """Ask a question and get an answer from GitHub repository using RAG"""
 
-    global rag
+    chunk_step = _chunk_step(chunk_size, overlap)
 
     try:
-        allowed_extensions = (
-            set(extensions.split(","))
-            if extensions
-            else RepositoryConfig.DEFAULT_EXTENSIONS.value
-        )
+        allowed_extensions = _parse_extensions(extensions)
 
         if verbose:
-            typer.echo(f"🔍 Searching for: {question}")
-            typer.echo(f"📁 Repository: {repo_owner}/{repo_name}")
-            typer.echo(f"📄 Extensions: {allowed_extensions}")
+            typer.echo(f"{icon('🔍 ')}Searching for: {question}")
+            _echo_settings(
+                repo_owner, repo_name, allowed_extensions, chunk_size, chunk_step
+            )
 
-        # Initialize RAG if not already done
-        if rag is None:
-            if verbose:
-                typer.echo("📥 Loading repository data...")
-
-            # Calculate step from overlap ratio
-            chunk_step = int(chunk_size * (1 - overlap))
-
-            # Initialize and load repository using TextRAG
-            rag = TextRAG(search_type=search_type, model_name=model_name)
-            rag.load_repository(
-                repo_owner=repo_owner,
-                repo_name=repo_name,
-                allowed_extensions=allowed_extensions,
-                chunk_size=chunk_size,
-                chunk_step=chunk_step,
+        # The repository is only loaded if the semantic cache misses
+        load_rag = partial(
+            _get_rag,
+            ctx.obj,
+            repo_owner=repo_owner,
+            repo_name=repo_name,
+            allowed_extensions=allowed_extensions,
+            chunk_size=chunk_size,
+            chunk_step=chunk_step,
+            search_type=search_type,
+            model_name=model_name,
+            use_cache=not no_cache,
+            verbose=verbose,
+        )
+        # Answers are only valid for the exact index they were built from;
+        # the key is pure, so a cache hit still skips loading the repository
+        namespace = _index_key(
+            repo_owner,
+            repo_name,
+            allowed_extensions,
+            chunk_size,
+            chunk_step,
+            search_type,
+            model_name,
+        )
+        cache = _open_semantic_cache(model_name) if semantic_cache else None
+        try:
+            rag_response = _cached_query(
+                load_rag,
+                question,
+                cache,
+                namespace,
+                use_fallback=fallback,
+                verbose=verbose,
             )
+        finally:
+            if cache is not None:
+                cache.close()
 
-            if verbose:
-                typer.echo(f"📚 Loaded {len(rag.documents)} files")
+        _echo_response(question, rag_response, search_type, verbose)
+
+    except ValueError as e:
+        _echo_error(f"Error: {e}", "Please check your input and try again.")
+        raise typer.Exit(1)
+
+    except Exception as e:
+        _echo_error(
+            f"Unexpected Error: {e}", "Please check your configuration and try again."
+        )
+        raise typer.Exit(1)
+
+
+@app.command()
+def ask_batch(
+    ctx: typer.Context,
+    questions_file: Path = typer.Argument(
+        ...,
+        exists=True,
+        dir_okay=False,
+        readable=True,
+        help="Text file with one question per line",
+    ),
+    chunk_size: int = CHUNK_SIZE_ARGUMENT,
+    overlap: float = OVERLAP_ARGUMENT,
+    concurrency: int = typer.Option(
+        MAX_BATCH_CONCURRENCY,
+        "--concurrency",
+        "-c",
+        min=1,
+        max=MAX_BATCH_CONCURRENCY,
+        clamp=True,
+        help="Number of questions answered in parallel",
+    ),
+    search_type: str = SEARCH_TYPE_OPTION,
+    model_name: str = MODEL_OPTION,
+    repo_owner: str = OWNER_OPTION,
+    repo_name: str = REPO_OPTION,
+    extensions: str = EXTENSIONS_OPTION,
+    semantic_cache: bool = SEMANTIC_CACHE_OPTION,
+    fallback: bool = FALLBACK_OPTION,
+    no_cache: bool = NO_CACHE_OPTION,
+    verbose: bool = VERBOSE_OPTION,
+):
+    """Answer every question in a file against the same repository index"""
+
+    chunk_step = _chunk_step(chunk_size, overlap)
+
+    try:
+        questions = [
+            line.strip()
+            for line in questions_file.read_text(encoding="utf-8").splitlines()
+            if line.strip()
+        ]
+        if not questions:
+            raise ValueError(f"No questions found in {questions_file}")
+
+        allowed_extensions = _parse_extensions(extensions)
+
+        if verbose:
+            typer.echo(f"{icon('🔍 ')}Answering {len(questions)} questions")
+            _echo_settings(
+                repo_owner, repo_name, allowed_extensions, chunk_size, chunk_step
+            )
+
+        rag = _get_rag(
+            ctx.obj,
+            repo_owner=repo_owner,
+            repo_name=repo_name,
+            allowed_extensions=allowed_extensions,
+            chunk_size=chunk_size,
+            chunk_step=chunk_step,
+            search_type=search_type,
+            model_name=model_name,
+            use_cache=not no_cache,
+            verbose=verbose,
+        )
+
+        cache = _open_semantic_cache(model_name) if semantic_cache else None
+        namespace = _index_key(
+            repo_owner,
+            repo_name,
+            allowed_extensions,
+            chunk_size,
+            chunk_step,
+            search_type,
+            model_name,
+        )
+
+        def answer(question: str):
+            # Keep going when a single question fails; report it in place
+            try:
+                return _cached_query(
+                    lambda: rag, question, cache, namespace, use_fallback=fallback
+                )
+            except ValueError as e:
+                return e
+
+        # Retrieval and the OpenAI call are I/O-bound, so threads overlap them
+        try:
+            with ThreadPoolExecutor(max_workers=min(concurrency, len(questions))) as ex:
+                responses = list(ex.map(answer, questions))
+        finally:
+            if cache is not None:
+                cache.close()
+
+        failures = 0
+        for question, rag_response in zip(questions, responses):
+            if isinstance(rag_response, ValueError):
+                failures += 1
+                typer.echo(f"\n{icon('❓ ')}Question: {question}")
+                typer.echo(f"{icon('❌ ', err=True)}Error: {rag_response}", err=True)
+            else:
+                _echo_response(question, rag_response, search_type, verbose)
+
+    except ValueError as e:
+        _echo_error(f"Error: {e}", "Please check your input and try again.")
+        raise typer.Exit(1)
+
+    except Exception as e:
+        _echo_error(
+            f"Unexpected Error: {e}", "Please check your configuration and try again."
+        )
+        raise typer.Exit(1)
+
+    if failures:
+        raise typer.Exit(1)
 
-        rag_response = rag.query(question)
 
-        typer.echo(f"\n❓ Question: {question}")
-        typer.echo(f"💡 Answer: {rag_response.answer}")
-        typer.echo(f"🎯 Confidence: {rag_response.confidence:.2f}")
+@app.command()
+def repl(
+    ctx: typer.Context,
+    chunk_size: int = CHUNK_SIZE_ARGUMENT,
+    overlap: float = OVERLAP_ARGUMENT,
+    search_type: str = SEARCH_TYPE_OPTION,
+    model_name: str = MODEL_OPTION,
+    repo_owner: str = OWNER_OPTION,
+    repo_name: str = REPO_OPTION,
+    extensions: str = EXTENSIONS_OPTION,
+    semantic_cache: bool = SEMANTIC_CACHE_OPTION,
+    fallback: bool = FALLBACK_OPTION,
+    no_cache: bool = NO_CACHE_OPTION,
+    verbose: bool = VERBOSE_OPTION,
+):
+    """Ask questions interactively against one loaded repository"""
 
-        # Display the correct search method
-        if search_type == "vector_sentence_transformers":
-            typer.echo("🔧 Method: vector search (SentenceTransformers)")
-        elif search_type == "vector_minsearch":
-            typer.echo("🔧 Method: vector search (Minsearch)")
-        else:
-            typer.echo("🔧 Method: text search")
+    chunk_step = _chunk_step(chunk_size, overlap)
 
-        if verbose and rag_response.sources_used:
-            typer.echo("\n📚 Sources used:")
-            for i, source in enumerate(rag_response.sources_used, 1):
-                typer.echo(f"  {i}. {source}")
+    try:
+        allowed_extensions = _parse_extensions(extensions)
+
+        if verbose:
+            _echo_settings(
+                repo_owner, repo_name, allowed_extensions, chunk_size, chunk_step
+            )
 
-            if rag_response.reasoning:
-                typer.echo(f"\n💭 Reasoning: {rag_response.reasoning}")
+        # Loaded once; every question below reuses the index and the single
+        # OpenAI client, so its HTTP connection stays alive between questions
+        rag = _get_rag(
+            ctx.obj,
+            repo_owner=repo_owner,
+            repo_name=repo_name,
+            allowed_extensions=allowed_extensions,
+            chunk_size=chunk_size,
+            chunk_step=chunk_step,
+            search_type=search_type,
+            model_name=model_name,
+            use_cache=not no_cache,
+            verbose=verbose,
+        )
+        cache = _open_semantic_cache(model_name) if semantic_cache else None
+        namespace = _index_key(
+            repo_owner,
+            repo_name,
+            allowed_extensions,
+            chunk_size,
+            chunk_step,
+            search_type,
+            model_name,
+        )
 
     except ValueError as e:
-        typer.echo(f"❌ Error: {str(e)}", err=True)
-        typer.echo("💡 Please check your input and try again.", err=True)
+        _echo_error(f"Error: {e}", "Please check your input and try again.")
         raise typer.Exit(1)
 
     except Exception as e:
-        typer.echo(f"❌ Unexpected Error: {str(e)}", err=True)
-        typer.echo("💡 Please check your configuration and try again.", err=True)
+        _echo_error(
+            f"Unexpected Error: {e}", "Please check your configuration and try again."
+        )
         raise typer.Exit(1)
 
+    typer.echo("Type a question, or 'exit' to quit.")
+    try:
+        while True:
+            try:
+                question = input("> ").strip()
+            except (EOFError, KeyboardInterrupt):
+                typer.echo()
+                break
+
+            if not question:
+                continue
+            if question.lower() in {"exit", "quit"}:
+                break
+
+            try:
+                rag_response = _cached_query(
+                    lambda: rag,
+                    question,
+                    cache,
+                    namespace,
+                    use_fallback=fallback,
+                    verbose=verbose,
+                )
+            except ValueError as e:
+                _echo_error(f"Error: {e}", "Try rephrasing the question.")
+                continue
+
+            _echo_response(question, rag_response, search_type, verbose)
+    finally:
+        if cache is not None:
+            cache.close()
+
+
+def _echo_error(message: str, hint: str):
+    """Print an error message and a hint on stderr"""
+    error_icon = icon("❌ ", err=True)
+    hint_icon = icon("💡 ", err=True)
+    typer.echo(f"{error_icon}{message}\n{hint_icon}{hint}", err=True)
+
+
+def _echo_settings(
+    repo_owner: str,
+    repo_name: str,
+    allowed_extensions: frozenset[str],
+    chunk_size: int,
+    chunk_step: int,
+):
+    """Print the repository and chunking settings in verbose mode"""
+    lines = [
+        f"{icon('📁 ')}Repository: {repo_owner}/{repo_name}",
+        f"{icon('📄 ')}Extensions: {', '.join(sorted(allowed_extensions))}",
+    ]
+
+    # Each character lands in ~chunk_size/chunk_step chunks
+    ratio = chunk_size / chunk_step
+    if ratio > MAX_CHUNK_REDUNDANCY:
+        overlap = 1 - chunk_step / chunk_size
+        lines.append(
+            f"{icon('⚠️  ')}overlap={overlap:.2f} stores each character in "
+            f"~{ratio:.1f} chunks, multiplying indexing and embedding cost"
+        )
+
+    typer.echo("\n".join(lines))
+
+
+def _echo_response(
+    question: str, rag_response: "RAGAnswer", search_type: str, verbose: bool
+):
+    """Print a RAG answer with its confidence, search method and sources"""
+    # Collected and written at once: one write/flush instead of one per line
+    lines = [
+        f"\n{icon('❓ ')}Question: {question}",
+        f"{icon('💡 ')}Answer: {rag_response.answer}",
+        f"{icon('🎯 ')}Confidence: {rag_response.confidence:.2f}",
+    ]
+
+    # Display the correct search method
+    if search_type == "vector_sentence_transformers":
+        lines.append(f"{icon('🔧 ')}Method: vector search (SentenceTransformers)")
+    elif search_type == "hybrid":
+        lines.append(f"{icon('🔧 ')}Method: hybrid search (text + vector, RRF)")
+    elif search_type == "vector_minsearch":
+        lines.append(f"{icon('🔧 ')}Method: vector search (Minsearch)")
+    else:
+        lines.append(f"{icon('🔧 ')}Method: text search")
+
+    if verbose and rag_response.sources_used:
+        lines.append(f"\n{icon('📚 ')}Sources used:")
+        lines.extend(
+            f"  {i}. {source}" for i, source in enumerate(rag_response.sources_used, 1)
+        )
+
+        if rag_response.reasoning:
+            lines.append(f"\n{icon('💭 ')}Reasoning: {rag_response.reasoning}")
+
+    typer.echo("\n".join(lines))
+
+
+def _chunk_step(chunk_size: int, overlap: float) -> int:
+    """Calculate the chunk step from the overlap ratio, rejecting degenerate values"""
+    if chunk_size <= 0:
+        raise typer.BadParameter("must be positive", param_hint="'CHUNK_SIZE'")
+    if not 0.0 <= overlap < 1.0:
+        raise typer.BadParameter(
+            "must be between 0.0 and 1.0 (exclusive)", param_hint="'OVERLAP'"
+        )
+
+    chunk_step = int(chunk_size * (1 - overlap))
+    if chunk_step <= 0:
+        raise typer.BadParameter(
+            f"too close to 1.0 for chunk size {chunk_size}", param_hint="'OVERLAP'"
+        )
+    return chunk_step
+
+
+def _parse_extensions(extensions: str) -> frozenset[str]:
+    """Normalize a comma-separated extension list (e.g. "MD, .mdx") once"""
+    parsed = frozenset(
+        ext.strip().lower().lstrip(".") for ext in extensions.split(",") if ext.strip()
+    )
+    return parsed or DEFAULT_EXTENSIONS
+
+
+def _open_semantic_cache(model_name: str) -> "SemanticCache":
+    """Open the on-disk semantic answer cache using the given embedding model"""
+    from core.semantic_cache import SemanticCache
+
+    return SemanticCache(
+        get_sentence_transformer(str(model_name)), model_name=model_name
+    )
+
+
+def _cached_query(
+    load_rag: Callable[[], "TextRAG"],
+    question: str,
+    cache: "SemanticCache | None",
+    namespace: str,
+    use_fallback: bool = False,
+    verbose: bool = False,
+) -> "RAGAnswer":
+    """Answer a question, serving equivalent earlier questions from the cache"""
+    query_vector = None
+    if cache is not None:
+        # Same model and normalization as the vector index: embed only once
+        # and hand the vector to every step that needs it
+        query_vector = cache.embed(question)
+        cached = cache.lookup(question, namespace, query_vector)
+        if cached is not None:
+            if verbose:
+                typer.echo(f"{icon('⚡ ')}Answer served from semantic cache")
+            return cached
+
+    rag_response = load_rag().query(
+        question, use_fallback=use_fallback, query_vector=query_vector
+    )
+    if cache is not None:
+        cache.store(question, namespace, rag_response, query_vector)
+    return rag_response
+
+
+def _get_rag(
+    state: CLIState,
+    repo_owner: str,
+    repo_name: str,
+    allowed_extensions: frozenset[str],
+    chunk_size: int,
+    chunk_step: int,
+    search_type: str,
+    model_name: str,
+    use_cache: bool,
+    verbose: bool,
+) -> "TextRAG":
+    """Return the loaded TextRAG, building it only if the settings changed"""
+    key = _index_key(
+        repo_owner,
+        repo_name,
+        allowed_extensions,
+        chunk_size,
+        chunk_step,
+        search_type,
+        model_name,
+    )
+    if state.rag is not None and state.rag_key == key:
+        return state.rag
+
+    # Heavy dependencies (torch, openai, minsearch) are imported only once a
+    # command actually runs, so `--help` stays fast
+    from core.text_rag import TextRAG
+    from fetch_prep_data.pickle_utils import save_rag_state
+
+    if verbose:
+        typer.echo(f"{icon('📥 ')}Loading repository data...")
+
+    rag = None
+    cache_path = get_cache_dir() / f"{key}.json.gz"
+    if use_cache:
+        rag = _load_cached_rag(cache_path, verbose)
+
+    if rag is None:
+        # Initialize and load repository using TextRAG
+        rag = TextRAG(search_type=search_type, model_name=model_name)
+        rag.load_repository(
+            repo_owner=repo_owner,
+            repo_name=repo_name,
+            allowed_extensions=allowed_extensions,
+            chunk_size=chunk_size,
+            chunk_step=chunk_step,
+        )
+        try:
+            save_rag_state(rag.get_state(), cache_path, rag.get_embeddings())
+        except OSError as e:
+            if verbose:
+                typer.echo(f"{icon('⚠️  ')}Could not write index cache: {e}")
+        _prune_caches()
+
+    if verbose:
+        typer.echo(f"{icon('📚 ')}Loaded {len(rag.documents)} files")
+
+    state.rag = rag
+    state.rag_key = key
+    return rag
+
+
+def _index_key(
+    repo_owner: str,
+    repo_name: str,
+    allowed_extensions: frozenset[str],
+    chunk_size: int,
+    chunk_step: int,
+    search_type: str,
+    model_name: str,
+) -> str:
+    """Return a stable key identifying a repository/index configuration"""
+    return hashlib.sha256(
+        repr(
+            (
+                INDEX_CACHE_VERSION,
+                repo_owner,
+                repo_name,
+                sorted(allowed_extensions),
+                chunk_size,
+                chunk_step,
+                str(search_type),
+                str(model_name),
+            )
+        ).encode()
+    ).hexdigest()
+
+
+def _load_cached_rag(cache_path: Path, verbose: bool) -> "TextRAG | None":
+    """Restore a TextRAG from the index cache, or return None on a cache miss"""
+    from core.text_rag import TextRAG
+    from fetch_prep_data.pickle_utils import load_rag_state
+
+    try:
+        age = time.time() - cache_path.stat().st_mtime
+    except FileNotFoundError:
+        return None
+    if age > INDEX_CACHE_TTL_SECONDS:
+        if verbose:
+            typer.echo(f"{icon('⌛ ')}Index cache expired, reloading the repository")
+        return None
+
+    try:
+        state, embeddings = load_rag_state(cache_path)
+        rag = TextRAG.from_state(state, embeddings)
+    except FileNotFoundError:
+        return None
+    except (ValueError, KeyError) as e:
+        if verbose:
+            typer.echo(f"{icon('⚠️  ')}Ignoring unusable index cache: {e}")
+        return None
+
+    if verbose:
+        typer.echo(f"{icon('💾 ')}Loaded index from cache: {cache_path}")
+    return rag
+
+
+def _prune_caches():
+    """Delete expired index caches and embeddings that have not been reused"""
+    now = time.time()
+    # "*.json.*" covers each index with its embeddings and hash sidecars, and
+    # leaves the semantic cache database alone
+    for directory, pattern, ttl in (
+        (get_cache_dir(), "*.json.*", INDEX_CACHE_TTL_SECONDS),
+        (get_embedding_cache_dir(), "*.npy", EMBEDDING_CACHE_TTL_SECONDS),
+    ):
+        for path in directory.glob(pattern):
+            try:
+                if now - path.stat().st_mtime > ttl:
+                    path.unlink()
+            except OSError:
+                # Another process may have removed or replaced it meanwhile
+                continue
+
 
 if __name__ == "__main__":
     app()
@@ -1,10 +1,11 @@
 import os
-from enum import Enum, StrEnum
+from enum import StrEnum
+from functools import cache, lru_cache
+from pathlib import Path
+from typing import TYPE_CHECKING, Final
 
-from dotenv import load_dotenv
-from openai import OpenAI
-
-load_dotenv()
+if TYPE_CHECKING:
+    from openai import OpenAI
 
 
 class ModelType(StrEnum):
@@ -13,23 +14,35 @@ class ModelType(StrEnum):
     GPT_3_5_TURBO = "gpt-3.5-turbo"
 
 
-class ChunkingConfig(Enum):
-    DEFAULT_SIZE = 2000
-    DEFAULT_OVERLAP = 0.5
-    DEFAULT_CONTENT_FIELD = "content"
+# Chunking defaults
+DEFAULT_CHUNK_SIZE: Final[int] = 2000
+DEFAULT_OVERLAP: Final[float] = 0.5
+DEFAULT_CONTENT_FIELD: Final[str] = "content"
+
+# Repository defaults
+DEFAULT_REPO_OWNER: Final[str] = "pydantic"
+DEFAULT_REPO_NAME: Final[str] = "pydantic-ai"
+DEFAULT_EXTENSIONS: Final[frozenset[str]] = frozenset({"md", "mdx"})
+GITHUB_CODELOAD_URL: Final[str] = "https://codeload.github.com"
 
+# On-disk index cache, under get_cache_dir()
+INDEX_CACHE_VERSION: Final[int] = 2
+# Indexes track a moving branch, so rebuild them once they are this old
+INDEX_CACHE_TTL_SECONDS: Final[int] = 24 * 60 * 60
+# Embeddings not reused for this long are deleted
+EMBEDDING_CACHE_TTL_SECONDS: Final[int] = 30 * 24 * 60 * 60
 
-class RepositoryConfig(Enum):
-    DEFAULT_OWNER = "pydantic"
-    DEFAULT_NAME = "pydantic-ai"
-    DEFAULT_EXTENSIONS = {"md", "mdx"}
-    GITHUB_CODELOAD_URL = "https://codeload.github.com"
+# Semantic answer cache
+SEMANTIC_CACHE_THRESHOLD: Final[float] = 0.95
+SEMANTIC_CACHE_TTL_SECONDS: Final[int] = 7 * 24 * 60 * 60
+SEMANTIC_CACHE_MAX_ENTRIES: Final[int] = 1000
 
 
 class SearchType(StrEnum):
     TEXT = "text"
     VECTOR_MINSEARCH = "vector_minsearch"
     VECTOR_SENTENCE_TRANSFORMERS = "vector_sentence_transformers"
+    HYBRID = "hybrid"
 
 
 class InstructionType(StrEnum):
@@ -54,20 +67,63 @@ class SentenceTransformerModel(StrEnum):
     MULTI_QA_MINILM_L6_COS_V1 = "multi-qa-MiniLM-L6-cos-v1"
 
 
-class GitHubConfig(Enum):
-    BASE_URL = "https://codeload.github.com"
-    TIMEOUT = 30
-    MAX_FILE_SIZE = 10_000_000
-    MAX_FILES = 1000
-    MAX_TOTAL_SIZE = 50_000_000
+# GitHub download limits
+GITHUB_BASE_URL: Final[str] = "https://codeload.github.com"
+GITHUB_TIMEOUT: Final[int] = 30
+GITHUB_MAX_FILE_SIZE: Final[int] = 10_000_000
+GITHUB_MAX_FILES: Final[int] = 1000
+GITHUB_MAX_TOTAL_SIZE: Final[int] = 50_000_000
+
+# File processing limits
+MAX_FILE_SIZE: Final[int] = 10_000_000  # 10MB per file
+MAX_CONTENT_SIZE: Final[int] = 5_000_000  # 5MB content
+ALLOWED_EXTENSIONS: Final[frozenset[str]] = frozenset(
+    {"md", "mdx", "txt", "rst", "adoc"}
+)
+BLOCKED_EXTENSIONS: Final[frozenset[str]] = frozenset(
+    {"exe", "bat", "sh", "py", "js", "jar", "dll", "so"}
+)
+
+
+@cache
+def _ensure_env():
+    """Load variables from .env once, on first use rather than at import"""
+    from dotenv import load_dotenv
+
+    load_dotenv()
+
+
+@cache
+def get_cache_dir() -> Path:
+    """Return the on-disk cache directory, honouring XDG_CACHE_HOME from .env"""
+    _ensure_env()
+    return Path(os.getenv("XDG_CACHE_HOME", Path.home() / ".cache")) / "doxdisco"
+
+
+def get_embedding_cache_dir() -> Path:
+    """Return the directory of chunk embeddings keyed by model and chunk text"""
+    return get_cache_dir() / "embeddings"
+
+
+def get_semantic_cache_path() -> Path:
+    """Return the SQLite database of the semantic answer cache"""
+    return get_cache_dir() / "semantic_cache.sqlite3"
+
+
+@lru_cache(maxsize=4)
+def get_sentence_transformer(name: str):
+    """Load a SentenceTransformer model once per process and reuse it"""
+    # Hugging Face reads its cache and token variables when first imported
+    _ensure_env()
+    from sentence_transformers import SentenceTransformer
 
+    return SentenceTransformer(name)
 
-class FileProcessingConfig(Enum):
-    MAX_FILE_SIZE = 10_000_000  # 10MB per file
-    MAX_CONTENT_SIZE = 5_000_000  # 5MB content
-    ALLOWED_EXTENSIONS = {"md", "mdx", "txt", "rst", "adoc"}
-    BLOCKED_EXTENSIONS = {"exe", "bat", "sh", "py", "js", "jar", "dll", "so"}
 
+@cache
+def get_openai_client() -> "OpenAI":
+    """Return the process-wide OpenAI client, creating it on first use"""
+    from openai import OpenAI
 
-API_KEY = os.getenv("OPENAI_API_KEY")
-openai_client = OpenAI(api_key=API_KEY)
+    _ensure_env()
+    return OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
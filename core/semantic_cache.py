@@ -0,0 +1,143 @@
+# Persistent semantic cache for RAG answers
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+import numpy as np
+
+from config import (
+    SEMANTIC_CACHE_MAX_ENTRIES,
+    SEMANTIC_CACHE_THRESHOLD,
+    SEMANTIC_CACHE_TTL_SECONDS,
+    get_semantic_cache_path,
+)
+from prompt.models import RAGAnswer
+
+if TYPE_CHECKING:
+    from sentence_transformers import SentenceTransformer
+
+
+class SemanticCache:
+    """SQLite-backed cache of RAG answers, matched by question embedding similarity"""
+
+    def __init__(
+        self,
+        embedder: "SentenceTransformer",
+        model_name: str,
+        db_path: Path | None = None,
+        threshold: float = SEMANTIC_CACHE_THRESHOLD,
+        ttl_seconds: int = SEMANTIC_CACHE_TTL_SECONDS,
+        max_entries: int = SEMANTIC_CACHE_MAX_ENTRIES,
+    ):
+        self.embedder = embedder
+        self.model_name = str(model_name)
+        self.threshold = threshold
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+
+        if db_path is None:
+            db_path = get_semantic_cache_path()
+        db_path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(db_path, check_same_thread=False)
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS answers (
+                id INTEGER PRIMARY KEY,
+                namespace TEXT NOT NULL,
+                model TEXT NOT NULL,
+                question TEXT NOT NULL,
+                embedding BLOB NOT NULL,
+                answer TEXT NOT NULL,
+                created_at REAL NOT NULL
+            )
+            """
+        )
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS answers_namespace "
+            "ON answers (namespace, model, created_at)"
+        )
+        self._conn.commit()
+
+    def lookup(
+        self,
+        question: str,
+        namespace: str,
+        query_embedding: np.ndarray | None = None,
+    ) -> RAGAnswer | None:
+        """Return a cached answer for a semantically equivalent question, if any"""
+        if query_embedding is None:
+            query_embedding = self.embed(question)
+        cutoff = time.time() - self.ttl_seconds
+
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT embedding, answer FROM answers "
+                "WHERE namespace = ? AND model = ? AND created_at >= ?",
+                (namespace, self.model_name, cutoff),
+            ).fetchall()
+
+        if not rows:
+            return None
+
+        embeddings = np.frombuffer(
+            b"".join(row[0] for row in rows), dtype=np.float32
+        ).reshape(len(rows), -1)
+        similarities = embeddings @ query_embedding
+        best = int(np.argmax(similarities))
+        if similarities[best] < self.threshold:
+            return None
+
+        return RAGAnswer.model_validate_json(rows[best][1])
+
+    def store(
+        self,
+        question: str,
+        namespace: str,
+        answer: RAGAnswer,
+        query_embedding: np.ndarray | None = None,
+    ) -> RAGAnswer:
+        """Cache an answer for a question and return it unchanged"""
+        if query_embedding is None:
+            query_embedding = self.embed(question)
+        now = time.time()
+
+        with self._lock:
+            self._conn.execute(
+                "DELETE FROM answers WHERE created_at < ?", (now - self.ttl_seconds,)
+            )
+            self._conn.execute(
+                "INSERT INTO answers "
+                "(namespace, model, question, embedding, answer, created_at) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (
+                    namespace,
+                    self.model_name,
+                    question,
+                    query_embedding.tobytes(),
+                    answer.model_dump_json(),
+                    now,
+                ),
+            )
+            # Lookups scan every row, so cap the table by dropping the oldest
+            self._conn.execute(
+                "DELETE FROM answers WHERE id IN ("
+                "SELECT id FROM answers ORDER BY created_at DESC LIMIT -1 OFFSET ?)",
+                (self.max_entries,),
+            )
+            self._conn.commit()
+
+        return answer
+
+    def close(self):
+        """Close the underlying database connection"""
+        self._conn.close()
+
+    def embed(self, question: str) -> np.ndarray:
+        """Embed and normalize a question for lookup() and store()"""
+        return np.asarray(
+            self.embedder.encode([question], normalize_embeddings=True)[0],
+            dtype=np.float32,
+        )
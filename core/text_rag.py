@@ -1,17 +1,22 @@
-from typing import Callable
+from typing import Any, Callable
 
+import numpy as np
 from minsearch import Index
-from sentence_transformers import SentenceTransformer
 
 from config import (
     SearchType,
     SentenceTransformerModel,
-    openai_client,
+    get_embedding_cache_dir,
+    get_openai_client,
+    get_sentence_transformer,
 )
 from fetch_prep_data.parser import parse_data
 from fetch_prep_data.reader import read_github_data
+from output import icon
 from prompt.chunking_utils import chunk_documents
+from prompt.hybrid_search import HybridIndex
 from prompt.llm_utils import query_with_context
+from prompt.models import RAGAnswer
 from prompt.vector_search import create_vector_index
 
 
@@ -39,16 +44,22 @@ class TextRAG:
         self.documents = []
         self.chunks = []
         self.index = None
-        self.embedder = None
 
-        if search_type == SearchType.VECTOR_SENTENCE_TRANSFORMERS:
-            self.embedder = SentenceTransformer(model_name)
+    @property
+    def embedder(self):
+        """The SentenceTransformer model, loaded on first use by vector searches"""
+        if self.search_type not in (
+            SearchType.VECTOR_SENTENCE_TRANSFORMERS,
+            SearchType.HYBRID,
+        ):
+            return None
+        return get_sentence_transformer(str(self.model_name))
 
     def load_repository(
         self,
         repo_owner: str,
         repo_name: str,
-        allowed_extensions: set | None = None,
+        allowed_extensions: frozenset[str] | None = None,
         filename_filter: Callable | None = None,
         chunk_size: int | None = None,
         chunk_step: int | None = None,
@@ -65,25 +76,79 @@ class TextRAG:
         parsed_data = parse_data(github_data)
 
         self.chunks = chunk_documents(parsed_data, size=chunk_size, step=chunk_step)
-        print(f"📝 Created {len(self.chunks)} document chunks")
+        print(f"{icon('📝 ')}Created {len(self.chunks)} document chunks")
 
+        self._build_index()
+        self.documents = parsed_data
+
+    def get_state(self) -> dict[str, Any]:
+        """Return the loaded repository state so it can be persisted and restored"""
+        return {
+            "search_type": str(self.search_type),
+            "model_name": str(self.model_name),
+            "text_fields": self.text_fields,
+            "documents": self.documents,
+            "chunks": self.chunks,
+        }
+
+    def get_embeddings(self) -> np.ndarray | None:
+        """Return the chunk embeddings of a vector index, if one was built"""
+        return getattr(self.index, "embeddings", None)
+
+    @classmethod
+    def from_state(
+        cls, state: dict[str, Any], embeddings: np.ndarray | None = None
+    ) -> "TextRAG":
+        """Rebuild a TextRAG from get_state() output without re-downloading the repo"""
+        rag = cls(
+            search_type=state["search_type"],
+            model_name=state["model_name"],
+            text_fields=state["text_fields"],
+        )
+        rag.documents = state["documents"]
+        rag.chunks = state["chunks"]
+        rag._build_index(embeddings)
+        return rag
+
+    def _build_index(self, embeddings: np.ndarray | None = None):
+        """Build the search index over the current chunks"""
         if self.search_type == SearchType.TEXT:
             self.index = Index(text_fields=self.text_fields)
             self.index.fit(self.chunks)
         elif self.search_type == SearchType.VECTOR_MINSEARCH:
             self.index = Index(text_fields=self.text_fields)
             self.index.fit(self.chunks)
-            print("⚠️  Vector minsearch not yet implemented, using text search")
+            print(
+                f"{icon('⚠️  ')}Vector minsearch not yet implemented, using text search"
+            )
         elif self.search_type == SearchType.VECTOR_SENTENCE_TRANSFORMERS:
-            if self.embedder is None:
-                raise ValueError("SentenceTransformer model not initialized")
-            self.index = create_vector_index(self.chunks, self.embedder)
+            self.index = self._build_vector_index(embeddings)
+        elif self.search_type == SearchType.HYBRID:
+            text_index = Index(text_fields=self.text_fields)
+            text_index.fit(self.chunks)
+            self.index = HybridIndex(text_index, self._build_vector_index(embeddings))
         else:
             raise ValueError(f"Unsupported search type: {self.search_type}")
 
-        self.documents = parsed_data
+    def _build_vector_index(self, embeddings: np.ndarray | None = None):
+        """Build a SentenceTransformers index, reusing embeddings when given"""
+        if self.embedder is None:
+            raise ValueError("SentenceTransformer model not initialized")
+        return create_vector_index(
+            self.chunks,
+            self.embedder,
+            embeddings,
+            model_name=str(self.model_name),
+            cache_dir=get_embedding_cache_dir(),
+        )
 
-    def query(self, question: str, instruction_type: str = "faq_assistant") -> str:
+    def query(
+        self,
+        question: str,
+        instruction_type: str = "faq_assistant",
+        use_fallback: bool = False,
+        query_vector: np.ndarray | None = None,
+    ) -> RAGAnswer:
         """Query the repository using text-based search"""
         if not self.index:
             raise ValueError("No repository loaded. Call load_repository() first.")
@@ -92,5 +157,7 @@ class TextRAG:
             question=question,
             index=self.index,
             instruction_type=instruction_type,
-            openai_client=openai_client,
+            openai_client=get_openai_client(),
+            use_fallback=use_fallback,
+            query_vector=query_vector,
         )
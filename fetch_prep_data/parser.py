@@ -5,11 +5,13 @@ from typing import Any
 
 import frontmatter
 
-from config import FileProcessingConfig, GitHubConfig
+from config import GITHUB_MAX_FILES, MAX_CONTENT_SIZE
+from output import icon
 
 from .reader import RawRepositoryFile
 
-MAX_FILES = GitHubConfig.MAX_FILES.value
+# Openers of the YAML, TOML and JSON frontmatter formats frontmatter detects
+FRONTMATTER_PREFIXES = ("---", "+++", "{")
 
 
 def parse_data(data_raw: list[RawRepositoryFile]) -> list[dict[str, Any]]:
@@ -28,37 +30,71 @@ def parse_data(data_raw: list[RawRepositoryFile]) -> list[dict[str, Any]]:
         ValueError: If input validation fails
     """
 
-    if len(data_raw) > MAX_FILES:
-        raise ValueError(f"Too many files: {len(data_raw)} (max: {MAX_FILES})")
+    if len(data_raw) > GITHUB_MAX_FILES:
+        raise ValueError(f"Too many files: {len(data_raw)} (max: {GITHUB_MAX_FILES})")
 
     data_parsed = []
     for f in data_raw:
-        if len(f.content) > FileProcessingConfig.MAX_CONTENT_SIZE.value:
-            print(f"⚠️  Skipping oversized file {f.filename}: {len(f.content)} bytes")
+        if len(f.content) > MAX_CONTENT_SIZE:
+            print(
+                f"{icon('⚠️  ')}Skipping oversized file {f.filename}: {len(f.content)} bytes"
+            )
             continue
+        data_parsed.append(_parse_one(f))
 
-        try:
-            post = frontmatter.loads(f.content)
-            data = post.to_dict()
-            data["filename"] = f.filename
+    return data_parsed
 
-            # Convert datetime and date objects to ISO format strings for JSON compatibility
-            data = _convert_datetime_to_string(data)
-            data_parsed.append(data)
 
-        except (frontmatter.FrontMatterError, UnicodeDecodeError) as e:
-            print(f"⚠️  Skipping frontmatter for {f.filename}: {str(e)[:50]}...")
+def _parse_one(f: RawRepositoryFile) -> dict[str, Any]:
+    """Parse one file's frontmatter, falling back to content only if it is invalid"""
+    # frontmatter strips the text and only parses a header at its very start,
+    # so files without one skip the parser with an identical result
+    text = f.content.strip()
+    if not text.startswith(FRONTMATTER_PREFIXES):
+        return {"content": text, "filename": f.filename}
 
-            # Create document with just content and filename
-            data = {
-                "content": f.content,
-                "filename": f.filename,
-                "title": "",
-                "description": "",
-            }
-            data_parsed.append(data)
+    try:
+        post = frontmatter.loads(f.content)
+        data = post.to_dict()
+        data["filename"] = f.filename
 
-    return data_parsed
+        # Convert datetime and date objects to ISO format strings for JSON compatibility
+        _convert_datetimes_inplace(data)
+        return data
+
+    except (frontmatter.FrontMatterError, UnicodeDecodeError) as e:
+        print(f"{icon('⚠️  ')}Skipping frontmatter for {f.filename}: {str(e)[:50]}...")
+
+        # Create document with just content and filename
+        return {
+            "content": f.content,
+            "filename": f.filename,
+            "title": "",
+            "description": "",
+        }
+
+
+def _convert_datetimes_inplace(obj: dict | list) -> None:
+    """
+    Replace datetime and date values in nested dicts and lists with ISO strings.
+
+    Frontmatter is mostly plain strings, so only the offending entries are
+    rewritten instead of copying every container. Other mapping and sequence
+    types are converted with _convert_datetime_to_string.
+
+    Args:
+        obj: Dictionary or list to update in place
+    """
+    items = obj.items() if isinstance(obj, dict) else enumerate(obj)
+    for key, value in items:
+        if isinstance(value, (datetime, date)):
+            obj[key] = value.isoformat()
+        elif isinstance(value, (dict, list)):
+            _convert_datetimes_inplace(value)
+        elif isinstance(value, (Mapping, Sequence)) and not isinstance(
+            value, (str, bytes, bytearray)
+        ):
+            obj[key] = _convert_datetime_to_string(value)
 
 
 def _convert_datetime_to_string(obj: Any) -> Any:
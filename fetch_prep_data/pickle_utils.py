@@ -1,10 +1,20 @@
+import gzip
 import hashlib
-import pickle
+import io
+import json
+import struct
 from datetime import datetime
 from pathlib import Path
 from typing import Any
 
-MAX_PICKLE_SIZE = 100_000_000  # 100MB
+import numpy as np
+
+from output import icon
+
+MAX_STATE_SIZE = 100_000_000  # 100MB
+# Documents are repetitive text; a low level gets most of the size win cheaply
+COMPRESS_LEVEL = 3
+GZIP_MAGIC = b"\x1f\x8b"
 
 
 def validate_path(filepath: str) -> Path:
@@ -15,7 +25,7 @@ def validate_path(filepath: str) -> Path:
 
 
 def save_parsed_data(
-    data: list[dict[str, Any]], filepath: str = "parsed_data.pkl"
+    data: list[dict[str, Any]], filepath: str = "parsed_data.json.gz"
 ) -> None:
     filepath = validate_path(filepath)
 
@@ -26,68 +36,161 @@ def save_parsed_data(
         "metadata": {
             "total_files": len(data),
             "saved_at": datetime.now().isoformat(),
-            "version": "2.0",
+            "version": "3.0",
         },
     }
 
-    with open(filepath, "wb") as f:
-        pickle.dump(save_data, f)
+    _dump_json(save_data, filepath)
 
     _create_hash(filepath)
-    print(f"✅ Saved {len(data)} documents to {filepath}")
+    print(f"{icon('✅ ')}Saved {len(data)} documents to {filepath}")
+
+
+def load_parsed_data(filepath: str = "parsed_data.json.gz") -> list[dict[str, Any]]:
+    filepath = validate_path(filepath)
+
+    loaded = _load_verified_json(filepath)
+
+    if not isinstance(loaded, dict) or "data" not in loaded:
+        raise ValueError("Invalid data file")
+
+    data = loaded["data"]
+    if not isinstance(data, list):
+        raise ValueError("Data must be a list")
+
+    print(f"{icon('📚 ')}Loaded {len(data)} documents from {filepath}")
+    return data
 
 
-def load_parsed_data(filepath: str = "parsed_data.pkl") -> list[dict[str, Any]]:
+def save_rag_state(
+    state: dict[str, Any],
+    filepath: str,
+    embeddings: np.ndarray | None = None,
+) -> None:
+    """Persist a RAG state dict, storing embeddings in a sidecar float16 .npy file."""
     filepath = validate_path(filepath)
 
-    if not filepath.exists():
-        raise FileNotFoundError(f"File not found: {filepath}")
+    filepath.parent.mkdir(parents=True, exist_ok=True)
+
+    save_data = {
+        "state": state,
+        "metadata": {
+            "total_chunks": len(state.get("chunks", [])),
+            "has_embeddings": embeddings is not None,
+            "saved_at": datetime.now().isoformat(),
+            "version": "3.0",
+        },
+    }
+
+    _dump_json(save_data, filepath)
+    _create_hash(filepath)
+
+    if embeddings is not None:
+        embeddings_path = _embeddings_path(filepath)
+        with open(embeddings_path, "wb") as f:
+            np.save(f, embeddings.astype(np.float16), allow_pickle=False)
+        _create_hash(embeddings_path)
+
+
+def load_rag_state(filepath: str) -> tuple[dict[str, Any], np.ndarray | None]:
+    """Load a RAG state dict and its embeddings saved by save_rag_state()."""
+    filepath = validate_path(filepath)
 
-    if filepath.stat().st_size > MAX_PICKLE_SIZE:
+    loaded = _load_verified_json(filepath)
+
+    if not isinstance(loaded, dict) or not isinstance(loaded.get("state"), dict):
+        raise ValueError("Invalid state file")
+
+    embeddings = None
+    if loaded.get("metadata", {}).get("has_embeddings"):
+        embeddings_path = _embeddings_path(filepath)
+        try:
+            raw = _read_verified(embeddings_path)
+        except ValueError as e:
+            raise ValueError(f"Failed to verify embeddings integrity: {e}") from e
+        embeddings = np.load(io.BytesIO(raw), allow_pickle=False)
+
+    return loaded["state"], embeddings
+
+
+def _load_verified_json(filepath: Path) -> Any:
+    if _file_size(filepath) > MAX_STATE_SIZE:
         raise ValueError("File too large")
 
+    # Read once: the same bytes are hashed and, only if they match, decoded
     try:
-        _verify_hash(filepath)
+        raw = _read_verified(filepath)
     except ValueError as e:
-        raise ValueError(f"Failed to verify pickle file integrity: {e}") from e
+        raise ValueError(f"Failed to verify file integrity: {e}") from e
 
-    with open(filepath, "rb") as f:
-        loaded = pickle.load(f)
+    return _load_json(raw)
 
-    if not isinstance(loaded, dict) or "data" not in loaded:
-        raise ValueError("Invalid pickle file")
 
-    data = loaded["data"]
-    if not isinstance(data, list):
-        raise ValueError("Data must be a list")
+def _dump_json(obj: Any, filepath: Path) -> None:
+    # JSON keeps loading free of arbitrary object construction; default=str
+    # covers the odd non-JSON frontmatter value instead of failing the save
+    with gzip.open(filepath, "wt", encoding="utf-8", compresslevel=COMPRESS_LEVEL) as f:
+        json.dump(obj, f, ensure_ascii=False, default=str)
+
+
+def _load_json(raw: bytes) -> Any:
+    if raw.startswith(GZIP_MAGIC):
+        # The gzip trailer records the uncompressed size (mod 2**32)
+        (uncompressed_size,) = struct.unpack("<I", raw[-4:])
+        if uncompressed_size > MAX_STATE_SIZE:
+            raise ValueError("File too large")
+        try:
+            raw = gzip.decompress(raw)
+        except (OSError, EOFError) as e:
+            raise ValueError(f"Corrupt compressed file: {e}") from e
+
+    return json.loads(raw)
 
-    print(f"📚 Loaded {len(data)} documents from {filepath}")
-    return data
+
+def _embeddings_path(filepath: Path) -> Path:
+    return filepath.with_suffix(".npy")
 
 
 def _create_hash(filepath: Path) -> None:
     hash_file = filepath.with_suffix(filepath.suffix + ".hash")
-    with open(filepath, "rb") as f:
-        file_hash = hashlib.sha256(f.read()).hexdigest()
+    file_hash = _file_digest(filepath)
     with open(hash_file, "w") as f:
         f.write(file_hash)
 
 
-def _verify_hash(filepath: Path) -> None:
-    hash_file = filepath.with_suffix(filepath.suffix + ".hash")
+def _file_size(filepath: Path) -> int:
+    # A single stat() both confirms the file exists and reports its size
+    try:
+        return filepath.stat().st_size
+    except FileNotFoundError:
+        raise FileNotFoundError(f"File not found: {filepath}") from None
 
-    if not hash_file.exists():
-        raise ValueError("No integrity hash - refusing to load")
 
-    with open(filepath, "rb") as f:
-        current_hash = hashlib.sha256(f.read()).hexdigest()
+def _read_verified(filepath: Path) -> bytes:
+    hash_file = filepath.with_suffix(filepath.suffix + ".hash")
 
-    with open(hash_file, "r") as f:
-        stored_hash = f.read().strip()
+    try:
+        stored_hash = hash_file.read_text().strip()
+    except FileNotFoundError:
+        raise ValueError("No integrity hash - refusing to load") from None
+
+    try:
+        raw = filepath.read_bytes()
+    except FileNotFoundError:
+        raise FileNotFoundError(f"File not found: {filepath}") from None
+    current_hash = hashlib.sha256(raw).hexdigest()
 
     if current_hash != stored_hash:
         raise ValueError("File integrity check failed")
 
+    return raw
+
+
+def _file_digest(filepath: Path) -> str:
+    # Streams the file in fixed-size blocks instead of reading it whole
+    with open(filepath, "rb") as f:
+        return hashlib.file_digest(f, "sha256").hexdigest()
+
 
 def validate_data_structure(data: list[dict[str, Any]]) -> None:
     for i, item in enumerate(data):
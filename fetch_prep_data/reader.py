@@ -7,7 +7,23 @@ from typing import Callable, Optional
 import requests
 from pydantic import BaseModel, Field, HttpUrl
 
-from config import FileProcessingConfig, GitHubConfig, RepositoryConfig
+from config import (
+    ALLOWED_EXTENSIONS,
+    BLOCKED_EXTENSIONS,
+    DEFAULT_EXTENSIONS,
+    GITHUB_BASE_URL,
+    GITHUB_CODELOAD_URL,
+    GITHUB_MAX_FILE_SIZE,
+    GITHUB_MAX_FILES,
+    GITHUB_MAX_TOTAL_SIZE,
+    GITHUB_TIMEOUT,
+    MAX_CONTENT_SIZE,
+    MAX_FILE_SIZE,
+)
+from output import icon
+
+# Read size when streaming the repository archive
+DOWNLOAD_CHUNK_SIZE = 1 << 20
 
 
 @dataclass
@@ -23,21 +39,21 @@ class RepositoryRequest(BaseModel):
     repo_name: str = Field(
         ..., min_length=1, max_length=100, pattern=r"^[a-zA-Z0-9_.-]+$"
     )
-    allowed_extensions: Optional[set] = Field(default=None, max_items=20)
+    allowed_extensions: Optional[frozenset[str]] = Field(default=None, max_items=20)
 
 
 class GitHubRequestConfig(BaseModel):
-    base_url: HttpUrl = Field(default=GitHubConfig.BASE_URL.value)
-    timeout: int = Field(default=GitHubConfig.TIMEOUT.value, ge=1, le=300)
-    max_file_size: int = Field(default=GitHubConfig.MAX_FILE_SIZE.value)
-    max_files: int = Field(default=GitHubConfig.MAX_FILES.value)
-    max_total_size: int = Field(default=GitHubConfig.MAX_TOTAL_SIZE.value)
+    base_url: HttpUrl = Field(default=GITHUB_BASE_URL)
+    timeout: int = Field(default=GITHUB_TIMEOUT, ge=1, le=300)
+    max_file_size: int = Field(default=GITHUB_MAX_FILE_SIZE)
+    max_files: int = Field(default=GITHUB_MAX_FILES)
+    max_total_size: int = Field(default=GITHUB_MAX_TOTAL_SIZE)
 
 
 def read_github_data(
     repo_owner: str,
     repo_name: str,
-    allowed_extensions: set | None = None,
+    allowed_extensions: frozenset[str] | None = None,
     filename_filter: Callable | None = None,
 ) -> list[RawRepositoryFile]:
     request = RepositoryRequest(
@@ -48,23 +64,17 @@ def read_github_data(
 
     repo_owner = request.repo_owner
     repo_name = request.repo_name
-    allowed_extensions = (
-        request.allowed_extensions or RepositoryConfig.DEFAULT_EXTENSIONS.value
-    )
+    allowed_extensions = request.allowed_extensions or DEFAULT_EXTENSIONS
 
     # Create GitHub config with security limits
     github_config = GitHubRequestConfig()
 
-    url = f"{RepositoryConfig.GITHUB_CODELOAD_URL.value}/{repo_owner}/{repo_name}/zip/refs/heads/main"
-
-    if filename_filter is None:
-
-        def filename_filter(filepath):
-            return True
+    url = f"{GITHUB_CODELOAD_URL}/{repo_owner}/{repo_name}/zip/refs/heads/main"
 
     try:
-        resp = requests.get(url, timeout=github_config.timeout)
-        resp.raise_for_status()
+        with requests.get(url, timeout=github_config.timeout, stream=True) as resp:
+            resp.raise_for_status()
+            archive = _download_archive(resp)
     except requests.exceptions.HTTPError as e:
         raise Exception(
             f"Failed to download repository: HTTP {e.response.status_code}"
@@ -74,40 +84,54 @@ def read_github_data(
     except requests.exceptions.RequestException as e:
         raise Exception(f"Network error: {e}") from e
 
-    file_config = FileProcessingConfig
-
-    zf = zipfile.ZipFile(io.BytesIO(resp.content))
-    repository_data = _extract_files(
-        zf, allowed_extensions, filename_filter, github_config, file_config
-    )
-    zf.close()
+    with zipfile.ZipFile(archive) as zf:
+        repository_data = _extract_files(
+            zf, allowed_extensions, filename_filter, github_config
+        )
 
     return repository_data
 
 
+def _download_archive(resp: requests.Response) -> io.BytesIO:
+    """Stream the response body into memory in large chunks."""
+    archive = io.BytesIO()
+    # Large reads into one growing buffer; resp.content would instead keep
+    # every chunk in a list and join them, briefly holding the archive twice
+    for chunk in resp.iter_content(chunk_size=DOWNLOAD_CHUNK_SIZE):
+        archive.write(chunk)
+
+    archive.seek(0)
+    return archive
+
+
 def _extract_files(
     zf: zipfile.ZipFile,
-    allowed_extensions: set,
-    filename_filter: Callable,
+    allowed_extensions: frozenset[str],
+    filename_filter: Callable | None,
     github_config: GitHubRequestConfig,
-    file_config: type,
 ) -> list[RawRepositoryFile]:
     """Extract and process files from the zip archive with security checks."""
     data = []
     skipped_stats = {"oversized": 0, "unsafe_type": 0, "filtered": 0, "processed": 0}
 
     for file_info in zf.infolist():
-        if file_info.file_size > file_config.MAX_FILE_SIZE.value:
+        # Directory entries carry no content; drop them before any path work
+        if file_info.is_dir():
+            continue
+
+        if file_info.file_size > MAX_FILE_SIZE:
             skipped_stats["oversized"] += 1
             continue
 
         filepath = _normalize_filepath(file_info.filename)
+        # Computed once per entry and shared by both checks below
+        ext = _get_extension(filepath)
 
-        if not _is_safe_file(filepath, file_config):
+        if not _is_safe_file(ext):
             skipped_stats["unsafe_type"] += 1
             continue
 
-        if _should_skip_file(filepath, allowed_extensions, filename_filter):
+        if _should_skip_file(filepath, ext, allowed_extensions, filename_filter):
             skipped_stats["filtered"] += 1
             continue
 
@@ -117,7 +141,7 @@ def _extract_files(
                 if content is not None:
                     content = content.strip()
 
-                if len(content) > file_config.MAX_CONTENT_SIZE.value:
+                if len(content) > MAX_CONTENT_SIZE:
                     skipped_stats["oversized"] += 1
                     continue
 
@@ -132,25 +156,27 @@ def _extract_files(
 
     total_skipped = sum(skipped_stats.values()) - skipped_stats["processed"]
     if total_skipped > 0:
-        print("📊 File processing summary:")
-        print(f"   ✅ Processed: {skipped_stats['processed']} files")
+        print(f"{icon('📊 ')}File processing summary:")
+        print(f"   {icon('✅ ')}Processed: {skipped_stats['processed']} files")
         if skipped_stats["oversized"] > 0:
-            print(f"   ⚠️  Skipped oversized: {skipped_stats['oversized']} files")
+            print(
+                f"   {icon('⚠️  ')}Skipped oversized: {skipped_stats['oversized']} files"
+            )
         if skipped_stats["unsafe_type"] > 0:
-            print(f"   🔒 Skipped unsafe types: {skipped_stats['unsafe_type']} files")
+            print(
+                f"   {icon('🔒 ')}Skipped unsafe types: {skipped_stats['unsafe_type']} files"
+            )
         if skipped_stats["filtered"] > 0:
-            print(f"   🔍 Filtered out: {skipped_stats['filtered']} files")
+            print(f"   {icon('🔍 ')}Filtered out: {skipped_stats['filtered']} files")
 
     return data
 
 
-def _is_safe_file(filepath: str, file_config: type) -> bool:
-    ext = _get_extension(filepath).lower()
-
-    if ext in file_config.BLOCKED_EXTENSIONS.value:
+def _is_safe_file(ext: str) -> bool:
+    if ext in BLOCKED_EXTENSIONS:
         return False
 
-    if ext in file_config.ALLOWED_EXTENSIONS.value:
+    if ext in ALLOWED_EXTENSIONS:
         return True
 
     # Block files without extensions (potential executables)
@@ -162,33 +188,32 @@ def _is_safe_file(filepath: str, file_config: type) -> bool:
 
 
 def _should_skip_file(
-    filepath: str, allowed_extensions: set, filename_filter: Callable
+    filepath: str,
+    ext: str,
+    allowed_extensions: frozenset[str],
+    filename_filter: Callable | None,
 ) -> bool:
     filepath = filepath.lower()
 
-    if filepath.endswith("/"):
-        return True
-
     # hidden file
-    filename = filepath.split("/")[-1]
-    if filename.startswith("."):
+    if filepath.rpartition("/")[2].startswith("."):
         return True
 
-    if allowed_extensions:
-        ext = _get_extension(filepath)
-        if ext not in allowed_extensions:
-            return True
+    if allowed_extensions and ext not in allowed_extensions:
+        return True
 
-    if not filename_filter(filepath):
+    # No filter is the common case, so skip the call instead of an accept-all stub
+    if filename_filter is not None and not filename_filter(filepath):
         return True
 
     return False
 
 
 def _get_extension(filepath: str) -> str:
-    filename = filepath.lower().split("/")[-1]
+    """Return the lower-cased extension of a path, or "" if it has none."""
+    filename = filepath.rpartition("/")[2]
     if "." in filename:
-        return filename.rsplit(".", maxsplit=1)[-1]
+        return filename.rpartition(".")[2].lower()
     else:
         return ""
 
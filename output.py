@@ -0,0 +1,14 @@
+# Console output helpers shared by the CLI and library progress messages
+import sys
+from functools import cache
+
+
+@cache
+def _is_terminal(err: bool) -> bool:
+    # Checked once per stream: the answer cannot change during a command
+    return (sys.stderr if err else sys.stdout).isatty()
+
+
+def icon(prefix: str, err: bool = False) -> str:
+    """Return an emoji prefix on a terminal, and nothing when output is piped"""
+    return prefix if _is_terminal(err) else ""
@@ -2,6 +2,8 @@
 
 from typing import Any, Iterable
 
+from config import DEFAULT_CHUNK_SIZE, DEFAULT_CONTENT_FIELD, DEFAULT_OVERLAP
+
 
 def _sliding_window(seq: Iterable[Any], size: int, step: int) -> list[dict[str, Any]]:
     """
@@ -70,18 +72,13 @@ def chunk_documents(
         >>> documents = [{'text': 'long text...', 'filename': 'doc.txt'}]
         >>> chunks = chunk_documents(documents, content_field_name='text')
     """
-    from config import ChunkingConfig
-
     if size is None:
-        size = ChunkingConfig.DEFAULT_SIZE.value
+        size = DEFAULT_CHUNK_SIZE
     if step is None:
         # Calculate step from default overlap
-        step = int(
-            ChunkingConfig.DEFAULT_SIZE.value
-            * (1 - ChunkingConfig.DEFAULT_OVERLAP.value)
-        )
+        step = int(DEFAULT_CHUNK_SIZE * (1 - DEFAULT_OVERLAP))
     if content_field_name is None:
-        content_field_name = ChunkingConfig.DEFAULT_CONTENT_FIELD.value
+        content_field_name = DEFAULT_CONTENT_FIELD
 
     results = []
 
@@ -0,0 +1,77 @@
+# Hybrid search fusing keyword (Minsearch) and vector (SentenceTransformers) rankings
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any
+
+import numpy as np
+
+from prompt.vector_search import NUM_RESULTS, VectorIndex
+
+# Damping constant from the original reciprocal rank fusion paper
+RRF_K = 60
+# Candidates each retriever contributes per requested result
+CANDIDATE_MULTIPLIER = 4
+
+# Runs keyword scoring while the calling thread embeds the query
+_text_search_pool = ThreadPoolExecutor(max_workers=4)
+
+
+class HybridIndex:
+    """Keyword and vector indexes over the same chunks, merged by rank fusion"""
+
+    def __init__(self, text_index: Any, vector_index: VectorIndex):
+        self.text_index = text_index
+        self.vector_index = vector_index
+
+    @property
+    def embeddings(self) -> np.ndarray:
+        return self.vector_index.embeddings
+
+    def search(
+        self,
+        query: str,
+        num_results: int = NUM_RESULTS,
+        boost_dict: dict[str, float] | None = None,
+        filter_dict: dict[str, Any] | None = None,
+        query_vector: np.ndarray | None = None,
+    ) -> list[dict[str, Any]]:
+        """Search both indexes concurrently and fuse their rankings"""
+        num_candidates = num_results * CANDIDATE_MULTIPLIER
+
+        text_future = _text_search_pool.submit(
+            self.text_index.search,
+            query,
+            boost_dict=boost_dict or {},
+            filter_dict=filter_dict or {},
+            num_results=num_candidates,
+        )
+        if query_vector is None:
+            query_vector = self.vector_index.embed_query(query)
+        vector_results = self.vector_index.search_by_vector(
+            query_vector, num_candidates
+        )
+
+        return _reciprocal_rank_fusion(
+            [vector_results, text_future.result()], num_results
+        )
+
+
+def _reciprocal_rank_fusion(
+    rankings: list[list[dict[str, Any]]], num_results: int
+) -> list[dict[str, Any]]:
+    """Score each chunk by the sum of 1 / (RRF_K + rank) over all rankings"""
+    scores: dict[tuple, float] = {}
+    chunks: dict[tuple, dict[str, Any]] = {}
+    for ranking in rankings:
+        for rank, chunk in enumerate(ranking, start=1):
+            # A chunk is identified by its file and offset in both indexes
+            key = (chunk.get("filename"), chunk.get("start"))
+            scores[key] = scores.get(key, 0.0) + 1.0 / (RRF_K + rank)
+            chunks.setdefault(key, chunk)
+
+    results = []
+    for key in sorted(scores, key=scores.__getitem__, reverse=True)[:num_results]:
+        result = dict(chunks[key])
+        result["rrf_score"] = scores[key]
+        results.append(result)
+
+    return results
@@ -1,22 +1,29 @@
 # LLM interaction utilities
 import re
-from typing import Any
+from typing import TYPE_CHECKING, Any
 
-from openai import OpenAI
+import numpy as np
 
 from config import InstructionType, ModelType
+from output import icon
 from prompt.models import RAGAnswer
 from prompt.prompt_builder import build_prompt
 from prompt.search_utils import search_documents
 
+if TYPE_CHECKING:
+    from openai import OpenAI
+
 CONFIDENCE = 0.5
+CONFIDENCE_PATTERN = re.compile(r"confidence[:\s]+([0-9.]+)")
 
 
 def query_with_context(
     question: str,
     index: Any = None,
-    openai_client: OpenAI | None = None,
+    openai_client: "OpenAI | None" = None,
     instruction_type: str = InstructionType.PYDANTIC_AI_EXPERT,
+    use_fallback: bool = False,
+    query_vector: np.ndarray | None = None,
 ) -> RAGAnswer:
     """
     Answer a question using RAG with structured Pydantic output.
@@ -26,6 +33,9 @@ def query_with_context(
         index: The search index to retrieve relevant documents
         openai_client: OpenAI client for generating responses
         instruction_type: Type of instruction/prompt template to use
+        use_fallback: Retry with a free-text prompt if structured output fails.
+            Off by default, as it costs a second LLM call per failure
+        query_vector: Precomputed normalized question embedding for vector search
 
     Returns:
         Structured RAGAnswer with validated data
@@ -37,7 +47,9 @@ def query_with_context(
         raise ValueError("OpenAI client is required")
 
     try:
-        search_results: list[dict[str, Any]] = search_documents(question, index)
+        search_results: list[dict[str, Any]] = search_documents(
+            question, index, query_vector
+        )
 
         user_prompt: str = build_prompt(question, search_results, instruction_type)
         messages = [{"role": "user", "content": user_prompt}]
@@ -48,13 +60,19 @@ def query_with_context(
             )
 
             rag_answer = response.output_parsed
-            if not rag_answer.answer.strip():
+            if rag_answer is None or not rag_answer.answer.strip():
                 raise ValueError("Empty answer received from LLM")
 
             return rag_answer
 
-        except Exception as e:
-            print("⚠️  Structured output failed, trying fallback...")
+        # Parsing and validation errors (pydantic's ValidationError included)
+        # are ValueErrors; API and network errors are not, and are reported
+        # by the generic handler below instead
+        except ValueError as e:
+            if not use_fallback:
+                raise ValueError(f"Structured output failed: {str(e)}") from e
+
+            print(f"{icon('⚠️  ')}Structured output failed, trying fallback...")
             try:
                 fallback_response = _generate_fallback_response(
                     question, search_results, openai_client
@@ -65,12 +83,15 @@ def query_with_context(
                     f"Both structured and fallback responses failed: {str(e)}"
                 ) from e
 
+    except ValueError:
+        raise
+
     except Exception as e:
         raise ValueError(f"Unexpected error in RAG processing: {str(e)}") from e
 
 
 def _generate_fallback_response(
-    question: str, search_results: list[dict[str, Any]], openai_client: OpenAI
+    question: str, search_results: list[dict[str, Any]], openai_client: "OpenAI"
 ) -> RAGAnswer:
     """
     Generate a fallback response when structured output parsing fails.
@@ -91,12 +112,15 @@ def _generate_fallback_response(
         ValueError: If fallback response generation fails
     """
     try:
+        # Trim the top results once; both the prompt and sources_used reuse them
+        top_results = [
+            (result.get("filename", "unknown"), result.get("content", "")[:500])
+            for result in search_results[:3]
+        ]
+
         # Create a simple prompt for fallback
         context_text = "\n\n".join(
-            [
-                f"Source: {result.get('filename', 'unknown')}\n{result.get('content', '')[:500]}"
-                for result in search_results[:3]
-            ]
+            f"Source: {filename}\n{content}" for filename, content in top_results
         )
 
         fallback_prompt = f"""
@@ -119,19 +143,16 @@ Provide a clear answer and rate your confidence from 0.0 to 1.0.
         answer_text = response.output_text.strip()
 
         confidence = CONFIDENCE
-        if "confidence" in answer_text.lower():
+        answer_text_lower = answer_text.lower()
+        if "confidence" in answer_text_lower:
             try:
-                confidence_match = re.search(
-                    r"confidence[:\s]+([0-9.]+)", answer_text.lower()
-                )
+                confidence_match = CONFIDENCE_PATTERN.search(answer_text_lower)
                 if confidence_match:
                     confidence = float(confidence_match.group(1))
             except (ValueError, AttributeError):
                 pass
 
-        sources_used = [
-            result.get("filename", "unknown") for result in search_results[:3]
-        ]
+        sources_used = [filename for filename, _ in top_results]
 
         return RAGAnswer(
             answer=answer_text,
@@ -1,63 +1,18 @@
 # Prompt construction utilities
 import json
+from types import MappingProxyType
 from typing import Any
 
 from config import InstructionType
-from prompt.models import SearchResult
 
-
-def build_prompt(
-    question: str,
-    search_results: list[dict[str, Any]],
-    instruction_type: str = InstructionType.PYDANTIC_AI_EXPERT,
-) -> str:
-    """
-    Build a structured prompt for the LLM using search results.
-
-    Converts raw search results into a structured format and creates a prompt
-    that instructs the LLM to respond in the RAGAnswer format.
-
-    Args:
-        question: The user's question to be answered
-        search_results: List of relevant document dictionaries from search
-        instruction_type: Type of instruction/prompt template to use
-
-    Returns:
-        Formatted prompt string ready for LLM processing
-    """
-
-    # Convert search results to structured format
-    structured_results = []
-    for result in search_results:
-        structured_results.append(
-            SearchResult(
-                content=result.get("content", ""),
-                filename=result.get("filename", "unknown"),
-                title=result.get("title"),
-                similarity_score=result.get("similarity_score"),
-            )
-        )
-
-    # Get the appropriate prompt template based on instruction type
-    if instruction_type == InstructionType.PYDANTIC_AI_EXPERT:
-        prompt = _build_pydantic_ai_expert_prompt(question, structured_results)
-    else:
-        prompt = _build_faq_assistant_prompt(question, structured_results)
-
-    return prompt
-
-
-def _build_faq_assistant_prompt(
-    question: str, structured_results: list[SearchResult]
-) -> str:
-    """Build prompt for FAQ assistant role"""
-    return f"""
+# Static prompt text, filled in with str.format per question
+FAQ_ASSISTANT_TEMPLATE = """
 Answer the following question based on the provided context documents.
 
 Question: {question}
 
 Context Documents:
-{json.dumps([result.dict() for result in structured_results], indent=2)}
+{context}
 
 Please provide a structured response with:
 1. A clear answer to the question
@@ -68,18 +23,13 @@ Please provide a structured response with:
 Respond in the exact format specified by the RAGAnswer model.
 """
 
-
-def _build_pydantic_ai_expert_prompt(
-    question: str, structured_results: list[SearchResult]
-) -> str:
-    """Build prompt for PydanticAI documentation expert role"""
-    return f"""
+PYDANTIC_AI_EXPERT_TEMPLATE = """
 You are a PydanticAI documentation expert. Answer the following question based on the provided context documents from the PydanticAI codebase.
 
 Question: {question}
 
 Context Documents:
-{json.dumps([result.dict() for result in structured_results], indent=2)}
+{context}
 
 As a PydanticAI expert, focus on:
 1. Providing accurate technical information about PydanticAI features, APIs, and usage patterns
@@ -96,3 +46,59 @@ Please provide a structured response with:
 
 Respond in the exact format specified by the RAGAnswer model.
 """
+
+# StrEnum keys hash like their values, so plain strings look up the same entry
+PROMPT_TEMPLATES = MappingProxyType(
+    {
+        InstructionType.FAQ_ASSISTANT: FAQ_ASSISTANT_TEMPLATE,
+        InstructionType.PYDANTIC_AI_EXPERT: PYDANTIC_AI_EXPERT_TEMPLATE,
+    }
+)
+
+
+def build_prompt(
+    question: str,
+    search_results: list[dict[str, Any]],
+    instruction_type: str = InstructionType.PYDANTIC_AI_EXPERT,
+) -> str:
+    """
+    Build a structured prompt for the LLM using search results.
+
+    Reduces raw search results to the SearchResult fields and creates a prompt
+    that instructs the LLM to respond in the RAGAnswer format.
+
+    Args:
+        question: The user's question to be answered
+        search_results: List of relevant document dictionaries from search
+        instruction_type: Type of instruction/prompt template to use
+
+    Returns:
+        Formatted prompt string ready for LLM processing
+    """
+
+    # Plain dicts with the prompt.models.SearchResult fields; the results come
+    # from our own indexes, so validating a model per result buys nothing
+    structured_results = [
+        {
+            "content": result.get("content", ""),
+            "filename": result.get("filename", "unknown"),
+            "title": result.get("title"),
+            "similarity_score": result.get("similarity_score"),
+        }
+        for result in search_results
+    ]
+
+    # Get the appropriate prompt template based on instruction type
+    template = PROMPT_TEMPLATES.get(instruction_type, FAQ_ASSISTANT_TEMPLATE)
+    return template.format(
+        question=question, context=_format_context(structured_results)
+    )
+
+
+def _format_context(structured_results: list[dict[str, Any]]) -> str:
+    """Serialize search results as compact JSON; indentation only adds tokens"""
+    return json.dumps(
+        structured_results,
+        ensure_ascii=False,
+        separators=(",", ":"),
+    )
@@ -1,9 +1,39 @@
+from types import MappingProxyType
 from typing import Any
 
+import numpy as np
+
+from prompt.hybrid_search import HybridIndex
+from prompt.vector_search import VectorIndex
+
 NUM_RESULTS = 5
 
+BOOST_DICT = MappingProxyType(
+    {
+        # Core programming concepts (highest priority)
+        "def ": 2.5,  # Function definitions
+        "function": 2.0,  # Function mentions
+        "tool": 2.0,  # Tool mentions
+        "tools": 2.0,  # Tools plural
+        # Implementation details (medium priority)
+        "return": 1.4,  # Return statements
+        "yield": 1.4,  # Yield statements
+        "async": 1.3,  # Async functions
+        "await": 1.3,  # Await statements
+        # Documentation (lower priority but still useful)
+        "example": 1.2,  # Examples
+        "usage": 1.2,  # Usage patterns
+        "note": 1.1,  # Notes
+    }
+)
+NO_FILTERS = MappingProxyType({})
+
 
-def search_documents(question: str, index: Any | None = None) -> list[dict[str, Any]]:
+def search_documents(
+    question: str,
+    index: Any | None = None,
+    query_vector: np.ndarray | None = None,
+) -> list[dict[str, Any]]:
     """
     Search for relevant documents using the provided search index.
 
@@ -13,6 +43,8 @@ def search_documents(question: str, index: Any | None = None) -> list[dict[str,
     Args:
         question: The search query/question to find relevant documents for
         index: The search index to query (Minsearch Index or VectorIndex)
+        query_vector: Normalized question embedding already computed by the caller,
+            used by vector indexes instead of embedding the question again
 
     Returns:
         List of relevant document dictionaries with content, filename, and metadata
@@ -26,35 +58,26 @@ def search_documents(question: str, index: Any | None = None) -> list[dict[str,
     if index is None:
         raise ValueError("Search index is required")
 
-    boost_dict = {
-        # Core programming concepts (highest priority)
-        "def ": 2.5,  # Function definitions
-        "function": 2.0,  # Function mentions
-        "tool": 2.0,  # Tool mentions
-        "tools": 2.0,  # Tools plural
-        # Implementation details (medium priority)
-        "return": 1.4,  # Return statements
-        "yield": 1.4,  # Yield statements
-        "async": 1.3,  # Async functions
-        "await": 1.3,  # Await statements
-        # Documentation (lower priority but still useful)
-        "example": 1.2,  # Examples
-        "usage": 1.2,  # Usage patterns
-        "note": 1.1,  # Notes
-    }
-
-    # Check if it's a vector index by checking the class name
-    is_vector = hasattr(index, "__class__") and "VectorIndex" in str(index.__class__)
-
     try:
-        if is_vector:
-            # Vector search (query, num_results)
-            results = index.search(question, num_results=NUM_RESULTS)
+        if isinstance(index, HybridIndex):
+            results = index.search(
+                question,
+                num_results=NUM_RESULTS,
+                boost_dict=BOOST_DICT,
+                filter_dict=NO_FILTERS,
+                query_vector=query_vector,
+            )
+        elif isinstance(index, VectorIndex):
+            if query_vector is not None:
+                results = index.search_by_vector(query_vector, num_results=NUM_RESULTS)
+            else:
+                results = index.search(question, num_results=NUM_RESULTS)
         else:
+            # Minsearch text index
             results = index.search(
                 question,
-                boost_dict=boost_dict,
-                filter_dict={},
+                boost_dict=BOOST_DICT,
+                filter_dict=NO_FILTERS,
                 num_results=NUM_RESULTS,
             )
     except Exception as e:
@@ -1,25 +1,61 @@
 # Vector search implementation using SentenceTransformers
-from typing import Any
+import hashlib
+import os
+from functools import lru_cache
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
 
 import numpy as np
-from sentence_transformers import SentenceTransformer
+
+from output import icon
+
+if TYPE_CHECKING:
+    from sentence_transformers import SentenceTransformer
 
 NUM_RESULTS = 5
+# Chunks per forward pass when embedding; larger batches favour GPUs
+EMBEDDING_BATCH_SIZE = 64
+# Bump when the way chunk texts are embedded changes, to invalidate the cache
+EMBEDDING_CACHE_VERSION = 1
+# Half-precision halves cache size; unit vectors keep ample precision for
+# cosine ranking, and are widened back to float32 for scoring when loaded
+EMBEDDING_STORAGE_DTYPE = np.float16
+# Recent query embeddings kept per index, so repeated questions skip the model
+QUERY_EMBEDDING_CACHE_SIZE = 256
 
 
 class VectorIndex:
     """Vector-based search index using SentenceTransformers embeddings"""
 
-    def __init__(self, model: SentenceTransformer, chunks: list[dict[str, Any]]):
+    def __init__(
+        self,
+        model: "SentenceTransformer",
+        chunks: list[dict[str, Any]],
+        embeddings: np.ndarray | None = None,
+        model_name: str | None = None,
+        cache_dir: Path | None = None,
+    ):
         self.model = model
         self.chunks = chunks
-        self.embeddings = None
-        self._build_index()
+        self.model_name = model_name
+        self.cache_dir = cache_dir
+        self.embed_query = lru_cache(maxsize=QUERY_EMBEDDING_CACHE_SIZE)(
+            self._encode_query
+        )
+        self.embeddings = embeddings
+        if self.embeddings is None:
+            self._build_index()
+        elif len(self.embeddings) != len(self.chunks):
+            raise ValueError(
+                f"Embedding count ({len(self.embeddings)}) does not match "
+                f"chunk count ({len(self.chunks)})"
+            )
+
+        # One contiguous float32 matrix keeps scoring a single BLAS matvec
+        self.embeddings = np.ascontiguousarray(self.embeddings, dtype=np.float32)
 
     def _build_index(self):
         """Build the vector index by computing embeddings for all chunks"""
-        print("🔄 Computing embeddings for vector search...")
-
         # Extract text content from chunks
         texts = []
         for chunk in self.chunks:
@@ -35,21 +71,53 @@ class VectorIndex:
             combined_text = " ".join(text_parts)
             texts.append(combined_text)
 
-        # Compute embeddings
-        self.embeddings = self.model.encode(texts, show_progress_bar=True)
-        print(f"✅ Created embeddings with shape: {self.embeddings.shape}")
+        # Embeddings depend only on the model and the texts, so identical
+        # content is never embedded twice, whichever repo load produced it
+        cache_path = None
+        if self.cache_dir is not None and self.model_name is not None:
+            key = _embedding_key(self.model_name, texts)
+            cache_path = self.cache_dir / f"{key}.npy"
+            cached = _load_cached_embeddings(cache_path, len(texts))
+            if cached is not None:
+                self.embeddings = cached
+                print(
+                    f"{icon('✅ ')}Loaded cached embeddings with shape: {cached.shape}"
+                )
+                return
+
+        print(f"{icon('🔄 ')}Computing embeddings for vector search...")
+        # Compute embeddings, normalized so a dot product is cosine similarity
+        self.embeddings = self.model.encode(
+            texts,
+            batch_size=EMBEDDING_BATCH_SIZE,
+            convert_to_numpy=True,
+            normalize_embeddings=True,
+            show_progress_bar=True,
+        )
+        print(f"{icon('✅ ')}Created embeddings with shape: {self.embeddings.shape}")
+
+        if cache_path is not None:
+            _save_cached_embeddings(cache_path, self.embeddings)
 
     def search(
         self, query: str, num_results: int = NUM_RESULTS
     ) -> list[dict[str, Any]]:
         """Search for similar chunks using vector similarity"""
-        # Compute query embedding
-        query_embedding = self.model.encode([query])
+        return self.search_by_vector(self.embed_query(query), num_results)
 
+    def search_by_vector(
+        self, query_embedding: np.ndarray, num_results: int = NUM_RESULTS
+    ) -> list[dict[str, Any]]:
+        """Search with a normalized query embedding from the same model"""
         # Compute cosine similarity
-        similarities = np.dot(self.embeddings, query_embedding.T).flatten()
+        similarities = self.embeddings @ np.asarray(query_embedding, dtype=np.float32)
 
-        top_indices = np.argsort(similarities)[::-1][:num_results]
+        # Select the top k in O(n), then sort only those k
+        k = min(num_results, len(similarities))
+        if k <= 0:
+            return []
+        top_indices = np.argpartition(-similarities, k - 1)[:k]
+        top_indices = top_indices[np.argsort(-similarities[top_indices])]
 
         results = []
         for idx in top_indices:
@@ -59,9 +127,51 @@ class VectorIndex:
 
         return results
 
+    def _encode_query(self, query: str) -> np.ndarray:
+        return np.asarray(
+            self.model.encode([query], normalize_embeddings=True)[0],
+            dtype=np.float32,
+        )
+
 
 def create_vector_index(
-    chunks: list[dict[str, Any]], model: SentenceTransformer
+    chunks: list[dict[str, Any]],
+    model: "SentenceTransformer",
+    embeddings: np.ndarray | None = None,
+    model_name: str | None = None,
+    cache_dir: Path | None = None,
 ) -> VectorIndex:
-    """Create a vector index from chunks using the specified model"""
-    return VectorIndex(model, chunks)
+    """Create a vector index from chunks, reusing precomputed embeddings if given"""
+    return VectorIndex(model, chunks, embeddings, model_name, cache_dir)
+
+
+def _embedding_key(model_name: str, texts: list[str]) -> str:
+    digest = hashlib.sha256(f"{EMBEDDING_CACHE_VERSION}|{model_name}".encode())
+    for text in texts:
+        encoded = text.encode()
+        # Length-prefix each text so chunk boundaries are part of the key
+        digest.update(len(encoded).to_bytes(8, "little"))
+        digest.update(encoded)
+    return digest.hexdigest()
+
+
+def _load_cached_embeddings(cache_path: Path, count: int) -> np.ndarray | None:
+    try:
+        embeddings = np.load(cache_path, allow_pickle=False)
+        # Mark as recently used so cache pruning keeps it
+        os.utime(cache_path)
+    except (OSError, ValueError):
+        return None
+    return embeddings if len(embeddings) == count else None
+
+
+def _save_cached_embeddings(cache_path: Path, embeddings: np.ndarray) -> None:
+    # Best effort: a read-only cache dir only costs a recompute next time
+    try:
+        cache_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = cache_path.with_suffix(".tmp")
+        with open(tmp_path, "wb") as f:
+            np.save(f, embeddings.astype(EMBEDDING_STORAGE_DTYPE), allow_pickle=False)
+        os.replace(tmp_path, cache_path)
+    except OSError:
+        pass
@@ -0,0 +1,300 @@
+import os
+import time
+
+import numpy as np
+import pytest
+from typer.testing import CliRunner
+
+import cli
+from config import EMBEDDING_CACHE_TTL_SECONDS, INDEX_CACHE_TTL_SECONDS
+from core.semantic_cache import SemanticCache
+from fetch_prep_data.pickle_utils import save_rag_state
+from prompt.models import RAGAnswer
+
+runner = CliRunner()
+
+
+class ConstantEmbedder:
+    """Embeds every question identically, so any stored answer is a match"""
+
+    def encode(self, questions, normalize_embeddings=True):
+        return np.ones((len(questions), 4), dtype=np.float32) / 2
+
+
+class FakeRAG:
+    def __init__(self):
+        self.questions = []
+
+    def query(self, question, use_fallback=False, query_vector=None):
+        self.questions.append(question)
+        return RAGAnswer(
+            answer=f"answer to {question}", confidence=0.8, sources_used=[]
+        )
+
+
+@pytest.fixture
+def fake_rag(monkeypatch):
+    rag = FakeRAG()
+    monkeypatch.setattr(cli, "_get_rag", lambda state, **kwargs: rag)
+    return rag
+
+
+@pytest.fixture
+def semantic_cache_db(tmp_path, monkeypatch):
+    db_path = tmp_path / "semantic_cache.sqlite3"
+    monkeypatch.setattr(
+        cli,
+        "_open_semantic_cache",
+        lambda model_name: SemanticCache(
+            ConstantEmbedder(), model_name=model_name, db_path=db_path
+        ),
+    )
+    return db_path
+
+
+def test_semantic_cache_serves_same_index_configuration(fake_rag, semantic_cache_db):
+    for _ in range(2):
+        result = runner.invoke(cli.app, ["ask", "How?", "--semantic-cache"])
+        assert result.exit_code == 0, result.output
+
+    assert fake_rag.questions == ["How?"]
+
+
+@pytest.mark.parametrize(
+    "other_settings",
+    [
+        ["--extensions", "rst"],
+        ["--search-type", "hybrid"],
+        ["--repo", "pydantic"],
+        ["1000"],
+        ["2000", "0.25"],
+    ],
+)
+def test_semantic_cache_misses_for_other_index_configuration(
+    fake_rag, semantic_cache_db, other_settings
+):
+    first = runner.invoke(cli.app, ["ask", "How?", "--semantic-cache"])
+    second = runner.invoke(
+        cli.app, ["ask", "How?", *other_settings, "--semantic-cache"]
+    )
+
+    assert first.exit_code == 0, first.output
+    assert second.exit_code == 0, second.output
+    assert fake_rag.questions == ["How?", "How?"]
+
+
+def test_bare_question_runs_ask(fake_rag):
+    result = runner.invoke(cli.app, ["How do I install it?"])
+
+    assert result.exit_code == 0, result.output
+    assert fake_rag.questions == ["How do I install it?"]
+    assert "answer to How do I install it?" in result.output
+
+
+def test_bare_question_after_ask_options_runs_ask(fake_rag):
+    result = runner.invoke(cli.app, ["-s", "text", "How?", "1000", "0.25"])
+
+    assert result.exit_code == 0, result.output
+    assert fake_rag.questions == ["How?"]
+
+
+def test_help_lists_commands():
+    result = runner.invoke(cli.app, ["--help"])
+
+    assert result.exit_code == 0
+    for command in ("ask", "ask-batch", "repl"):
+        assert command in result.output
+
+
+def test_bare_question_help_shows_ask_help():
+    result = runner.invoke(cli.app, ["How?", "--help"])
+
+    assert result.exit_code == 0
+    assert "Ask a question and get an answer" in result.output
+
+
+def test_subcommand_name_runs_the_subcommand(fake_rag):
+    result = runner.invoke(cli.app, ["repl"], input="exit\n")
+
+    assert result.exit_code == 0, result.output
+    assert fake_rag.questions == []
+
+
+def test_question_named_like_a_subcommand_needs_ask(fake_rag):
+    result = runner.invoke(cli.app, ["ask", "repl"])
+
+    assert result.exit_code == 0, result.output
+    assert fake_rag.questions == ["repl"]
+
+
+class ClosingCache:
+    closed = False
+
+    def embed(self, question):
+        return np.ones(4, dtype=np.float32) / 2
+
+    def lookup(self, question, namespace, query_embedding=None):
+        return None
+
+    def close(self):
+        self.closed = True
+
+
+@pytest.fixture
+def closing_cache(monkeypatch):
+    cache = ClosingCache()
+    monkeypatch.setattr(cli, "_open_semantic_cache", lambda model_name: cache)
+    return cache
+
+
+@pytest.fixture
+def failing_rag(monkeypatch):
+    class FailingRAG:
+        def query(self, question, use_fallback=False, query_vector=None):
+            raise RuntimeError("connection reset")
+
+    monkeypatch.setattr(cli, "_get_rag", lambda state, **kwargs: FailingRAG())
+
+
+@pytest.mark.parametrize(
+    ("args", "stdin"),
+    [
+        (["ask", "How?"], None),
+        (["ask-batch", "QUESTIONS"], None),
+        (["repl"], "How?\n"),
+    ],
+)
+def test_semantic_cache_is_closed_when_a_query_fails(
+    tmp_path, closing_cache, failing_rag, args, stdin
+):
+    questions_file = tmp_path / "questions.txt"
+    questions_file.write_text("How?\n")
+    args = [str(questions_file) if arg == "QUESTIONS" else arg for arg in args]
+
+    result = runner.invoke(cli.app, [*args, "--semantic-cache"], input=stdin)
+
+    assert result.exit_code != 0
+    assert closing_cache.closed
+
+
+INDEX_SETTINGS = dict(
+    repo_owner="pydantic",
+    repo_name="pydantic-ai",
+    allowed_extensions=frozenset({"md", "mdx", "rst"}),
+    chunk_size=2000,
+    chunk_step=1000,
+    search_type="text",
+    model_name="all-MiniLM-L6-v2",
+)
+
+TEXT_STATE = {
+    "search_type": "text",
+    "model_name": "all-MiniLM-L6-v2",
+    "text_fields": ["content", "filename", "title", "description"],
+    "documents": [{"content": "Install with pip.", "filename": "install.md"}],
+    "chunks": [{"start": 0, "content": "Install with pip.", "filename": "install.md"}],
+}
+
+
+def _age(path, seconds):
+    mtime = time.time() - seconds
+    os.utime(path, (mtime, mtime))
+
+
+def test_index_key_is_stable():
+    key = cli._index_key(**INDEX_SETTINGS)
+    reordered = {
+        **INDEX_SETTINGS,
+        "allowed_extensions": frozenset({"rst", "mdx", "md"}),
+    }
+
+    assert len(key) == 64
+    assert cli._index_key(**INDEX_SETTINGS) == key
+    assert cli._index_key(**reordered) == key
+
+
+@pytest.mark.parametrize(
+    ("setting", "value"),
+    [
+        ("repo_owner", "other"),
+        ("repo_name", "other"),
+        ("allowed_extensions", frozenset({"md"})),
+        ("chunk_size", 1500),
+        ("chunk_step", 500),
+        ("search_type", "hybrid"),
+        ("model_name", "all-mpnet-base-v2"),
+    ],
+)
+def test_index_key_changes_with_each_setting(setting, value):
+    changed = {**INDEX_SETTINGS, setting: value}
+
+    assert cli._index_key(**changed) != cli._index_key(**INDEX_SETTINGS)
+
+
+def test_fresh_index_cache_is_loaded(tmp_path):
+    cache_path = tmp_path / "index.json.gz"
+    save_rag_state(TEXT_STATE, cache_path)
+
+    rag = cli._load_cached_rag(cache_path, verbose=False)
+
+    assert rag is not None
+    assert rag.chunks == TEXT_STATE["chunks"]
+
+
+def test_expired_index_cache_is_a_miss(tmp_path):
+    cache_path = tmp_path / "index.json.gz"
+    save_rag_state(TEXT_STATE, cache_path)
+    _age(cache_path, INDEX_CACHE_TTL_SECONDS + 60)
+
+    assert cli._load_cached_rag(cache_path, verbose=False) is None
+
+
+def test_missing_index_cache_is_a_miss(tmp_path):
+    assert cli._load_cached_rag(tmp_path / "index.json.gz", verbose=False) is None
+
+
+def test_tampered_index_cache_is_ignored(tmp_path, capsys):
+    cache_path = tmp_path / "index.json.gz"
+    save_rag_state(TEXT_STATE, cache_path)
+    cache_path.write_bytes(cache_path.read_bytes() + b"\0")
+
+    assert cli._load_cached_rag(cache_path, verbose=True) is None
+    assert "Ignoring unusable index cache" in capsys.readouterr().out
+
+
+def test_index_cache_with_invalid_state_is_ignored(tmp_path):
+    cache_path = tmp_path / "index.json.gz"
+    save_rag_state({"chunks": []}, cache_path)
+
+    assert cli._load_cached_rag(cache_path, verbose=False) is None
+
+
+def test_prune_deletes_only_expired_cache_files(tmp_path, monkeypatch):
+    index_dir = tmp_path / "doxdisco"
+    embedding_dir = index_dir / "embeddings"
+    embedding_dir.mkdir(parents=True)
+    monkeypatch.setattr(cli, "get_cache_dir", lambda: index_dir)
+    monkeypatch.setattr(cli, "get_embedding_cache_dir", lambda: embedding_dir)
+
+    expired = ["old.json.gz", "old.json.gz.hash", "old.json.npy", "old.json.npy.hash"]
+    fresh = ["new.json.gz", "new.json.gz.hash"]
+    for name in [*expired, *fresh, "semantic_cache.sqlite3", "notes.txt"]:
+        (index_dir / name).write_text("x")
+    for name in [*expired, "semantic_cache.sqlite3", "notes.txt"]:
+        _age(index_dir / name, INDEX_CACHE_TTL_SECONDS + 60)
+
+    (embedding_dir / "unused.npy").write_text("x")
+    _age(embedding_dir / "unused.npy", EMBEDDING_CACHE_TTL_SECONDS + 60)
+    (embedding_dir / "recent.npy").write_text("x")
+    _age(embedding_dir / "recent.npy", INDEX_CACHE_TTL_SECONDS + 60)
+
+    cli._prune_caches()
+
+    assert sorted(p.name for p in index_dir.iterdir()) == [
+        "embeddings",
+        "new.json.gz",
+        "new.json.gz.hash",
+        "notes.txt",
+        "semantic_cache.sqlite3",
+    ]
+    assert [p.name for p in embedding_dir.iterdir()] == ["recent.npy"]
@@ -0,0 +1,91 @@
+import numpy as np
+import pytest
+
+from prompt.hybrid_search import RRF_K, HybridIndex, _reciprocal_rank_fusion
+
+
+def _chunk(filename: str, start: int = 0) -> dict:
+    return {"filename": filename, "start": start, "content": f"{filename}@{start}"}
+
+
+class FakeTextIndex:
+    def __init__(self, results: list[dict]):
+        self.results = results
+
+    def search(self, query, boost_dict=None, filter_dict=None, num_results=10):
+        return self.results[:num_results]
+
+
+class FakeVectorIndex:
+    def __init__(self, results: list[dict]):
+        self.results = results
+        self.embeddings = np.zeros((len(results), 3), dtype=np.float32)
+        self.seen_vectors = []
+
+    def embed_query(self, query):
+        return np.ones(3, dtype=np.float32)
+
+    def search_by_vector(self, query_embedding, num_results=5):
+        self.seen_vectors.append(query_embedding)
+        return self.results[:num_results]
+
+
+def test_fusion_ranks_chunks_found_by_both_searches_first():
+    a, b, c, d = _chunk("a.md"), _chunk("b.md"), _chunk("c.md"), _chunk("d.md")
+
+    fused = _reciprocal_rank_fusion([[a, b, c], [d, c, a]], num_results=4)
+
+    # a: ranks 1 and 3, c: ranks 3 and 2, then b and d at rank 2 and 1 once
+    assert [r["filename"] for r in fused] == ["a.md", "c.md", "d.md", "b.md"]
+    assert fused[0]["rrf_score"] == pytest.approx(1 / (RRF_K + 1) + 1 / (RRF_K + 3))
+    assert fused[2]["rrf_score"] == pytest.approx(1 / (RRF_K + 1))
+
+
+def test_fusion_returns_a_chunk_found_by_both_searches_once():
+    vector_hit = {**_chunk("a.md"), "similarity_score": 0.8}
+    text_hit = _chunk("a.md")
+
+    fused = _reciprocal_rank_fusion([[vector_hit], [text_hit]], num_results=5)
+
+    assert len(fused) == 1
+    assert fused[0]["filename"] == "a.md"
+    assert fused[0]["rrf_score"] == pytest.approx(2 / (RRF_K + 1))
+
+
+def test_fusion_keeps_chunks_of_one_file_at_different_offsets_apart():
+    fused = _reciprocal_rank_fusion(
+        [[_chunk("a.md", 0), _chunk("a.md", 1000)]], num_results=5
+    )
+
+    assert [(r["filename"], r["start"]) for r in fused] == [
+        ("a.md", 0),
+        ("a.md", 1000),
+    ]
+
+
+def test_fusion_does_not_modify_input_chunks():
+    chunk = _chunk("a.md")
+
+    _reciprocal_rank_fusion([[chunk]], num_results=1)
+
+    assert "rrf_score" not in chunk
+
+
+def test_hybrid_search_merges_both_indexes_and_limits_results():
+    a, b, c = _chunk("a.md"), _chunk("b.md"), _chunk("c.md")
+    index = HybridIndex(FakeTextIndex([b, a]), FakeVectorIndex([a, c]))
+
+    results = index.search("question", num_results=2)
+
+    assert [r["filename"] for r in results] == ["a.md", "b.md"]
+
+
+def test_hybrid_search_uses_a_given_query_vector():
+    vector_index = FakeVectorIndex([_chunk("a.md")])
+    index = HybridIndex(FakeTextIndex([]), vector_index)
+    query_vector = np.array([0.0, 1.0, 0.0], dtype=np.float32)
+
+    index.search("question", query_vector=query_vector)
+
+    assert len(vector_index.seen_vectors) == 1
+    assert vector_index.seen_vectors[0] is query_vector
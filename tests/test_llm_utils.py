@@ -0,0 +1,75 @@
+from types import SimpleNamespace
+
+import pytest
+from pydantic import ValidationError
+
+import prompt.llm_utils as llm_utils
+from prompt.llm_utils import query_with_context
+from prompt.models import RAGAnswer
+
+
+class FakeResponses:
+    def __init__(self, outcome):
+        self.outcome = outcome
+
+    def parse(self, **kwargs):
+        if isinstance(self.outcome, Exception):
+            raise self.outcome
+        return SimpleNamespace(output_parsed=self.outcome)
+
+
+def _client(outcome):
+    return SimpleNamespace(responses=FakeResponses(outcome))
+
+
+def _validation_error() -> ValidationError:
+    try:
+        RAGAnswer.model_validate({"answer": "x", "confidence": 2.0})
+    except ValidationError as e:
+        return e
+    raise AssertionError("expected a validation error")
+
+
+@pytest.fixture(autouse=True)
+def no_search(monkeypatch):
+    monkeypatch.setattr(llm_utils, "search_documents", lambda *args: [])
+
+
+def test_returns_the_parsed_answer():
+    answer = RAGAnswer(answer="Use pip.", confidence=0.9, sources_used=["a.md"])
+
+    assert query_with_context("How?", openai_client=_client(answer)) is answer
+
+
+def test_validation_error_is_reported_as_structured_output_failure():
+    with pytest.raises(ValueError) as excinfo:
+        query_with_context("How?", openai_client=_client(_validation_error()))
+
+    assert str(excinfo.value).startswith("Structured output failed:")
+
+
+def test_empty_answer_is_reported_as_structured_output_failure():
+    empty = RAGAnswer(answer="  ", confidence=0.1, sources_used=[])
+
+    with pytest.raises(ValueError, match="^Structured output failed: Empty answer"):
+        query_with_context("How?", openai_client=_client(empty))
+
+
+def test_network_error_is_not_labelled_as_structured_output_failure():
+    with pytest.raises(ValueError) as excinfo:
+        query_with_context("How?", openai_client=_client(ConnectionError("down")))
+
+    assert str(excinfo.value) == "Unexpected error in RAG processing: down"
+
+
+def test_fallback_answers_after_a_validation_error(monkeypatch):
+    fallback = RAGAnswer(answer="Fallback.", confidence=0.5, sources_used=[])
+    monkeypatch.setattr(
+        llm_utils, "_generate_fallback_response", lambda *args: fallback
+    )
+
+    result = query_with_context(
+        "How?", openai_client=_client(_validation_error()), use_fallback=True
+    )
+
+    assert result is fallback
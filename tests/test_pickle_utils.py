@@ -0,0 +1,117 @@
+import numpy as np
+import pytest
+
+import fetch_prep_data.pickle_utils as pickle_utils
+from fetch_prep_data.pickle_utils import (
+    load_parsed_data,
+    load_rag_state,
+    save_parsed_data,
+    save_rag_state,
+)
+
+STATE = {
+    "search_type": "vector_sentence_transformers",
+    "model_name": "all-MiniLM-L6-v2",
+    "text_fields": ["content", "filename", "title", "description"],
+    "documents": [{"content": "Install with pip – or uv.", "filename": "a.md"}],
+    "chunks": [
+        {"start": 0, "content": "Install with pip", "filename": "a.md"},
+        {"start": 8, "content": "pip – or uv.", "filename": "a.md"},
+    ],
+}
+
+
+def _embeddings() -> np.ndarray:
+    rng = np.random.default_rng(0)
+    embeddings = rng.standard_normal((2, 8)).astype(np.float32)
+    return embeddings / np.linalg.norm(embeddings, axis=1, keepdims=True)
+
+
+def _flip_last_byte(path):
+    raw = bytearray(path.read_bytes())
+    raw[-1] ^= 0xFF
+    path.write_bytes(bytes(raw))
+
+
+def test_rag_state_round_trip_with_embeddings(tmp_path):
+    path = tmp_path / "index.json.gz"
+    embeddings = _embeddings()
+
+    save_rag_state(STATE, path, embeddings)
+    state, loaded = load_rag_state(path)
+
+    assert state == STATE
+    # Stored as float16, so equal only to half precision
+    assert loaded.shape == embeddings.shape
+    np.testing.assert_allclose(loaded, embeddings, atol=1e-3)
+
+
+def test_rag_state_round_trip_without_embeddings(tmp_path):
+    path = tmp_path / "index.json.gz"
+
+    save_rag_state(STATE, path)
+    state, embeddings = load_rag_state(path)
+
+    assert state == STATE
+    assert embeddings is None
+
+
+def test_parsed_data_round_trip(tmp_path):
+    path = tmp_path / "parsed_data.json.gz"
+
+    save_parsed_data(STATE["documents"], path)
+
+    assert load_parsed_data(path) == STATE["documents"]
+
+
+def test_tampered_state_is_rejected(tmp_path):
+    path = tmp_path / "index.json.gz"
+    save_rag_state(STATE, path)
+    _flip_last_byte(path)
+
+    with pytest.raises(ValueError, match="integrity check failed"):
+        load_rag_state(path)
+
+
+def test_tampered_embeddings_are_rejected(tmp_path):
+    path = tmp_path / "index.json.gz"
+    save_rag_state(STATE, path, _embeddings())
+    _flip_last_byte(path.with_suffix(".npy"))
+
+    with pytest.raises(ValueError, match="embeddings integrity"):
+        load_rag_state(path)
+
+
+def test_state_without_hash_is_rejected(tmp_path):
+    path = tmp_path / "index.json.gz"
+    save_rag_state(STATE, path)
+    (tmp_path / "index.json.gz.hash").unlink()
+
+    with pytest.raises(ValueError, match="No integrity hash"):
+        load_rag_state(path)
+
+
+def test_oversized_state_file_is_rejected(tmp_path, monkeypatch):
+    path = tmp_path / "index.json.gz"
+    save_rag_state(STATE, path)
+    monkeypatch.setattr(pickle_utils, "MAX_STATE_SIZE", path.stat().st_size - 1)
+
+    with pytest.raises(ValueError, match="File too large"):
+        load_rag_state(path)
+
+
+def test_oversized_uncompressed_state_is_rejected(tmp_path, monkeypatch):
+    path = tmp_path / "index.json.gz"
+    state = {**STATE, "documents": [{"content": "x" * 100_000, "filename": "a.md"}]}
+    save_rag_state(state, path)
+    # Compressed file passes the size check; its decompressed size does not
+    monkeypatch.setattr(pickle_utils, "MAX_STATE_SIZE", 50_000)
+    assert path.stat().st_size < 50_000
+
+    with pytest.raises(ValueError, match="File too large"):
+        load_rag_state(path)
+
+
+def test_missing_state_file_raises_file_not_found(tmp_path):
+    with pytest.raises(FileNotFoundError):
+        load_rag_state(tmp_path / "missing.json.gz")
@@ -0,0 +1,166 @@
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pytest
+
+import core.semantic_cache as semantic_cache_module
+from core.semantic_cache import SemanticCache
+from prompt.models import RAGAnswer
+
+NAMESPACE = "pydantic/pydantic-ai"
+
+
+class FakeEmbedder:
+    """Maps known questions to fixed vectors and the rest to one-hot vectors"""
+
+    def __init__(self, vectors: dict[str, list[float]] | None = None, dim: int = 64):
+        self.vectors = vectors or {}
+        self.dim = dim
+
+    def encode(self, questions, normalize_embeddings=True):
+        rows = []
+        for question in questions:
+            if question in self.vectors:
+                row = np.asarray(self.vectors[question], dtype=np.float32)
+            else:
+                row = np.zeros(self.dim, dtype=np.float32)
+                row[int(question.rsplit(" ", 1)[-1]) % self.dim] = 1.0
+            rows.append(row / np.linalg.norm(row))
+        return np.stack(rows)
+
+
+def _answer(text: str) -> RAGAnswer:
+    return RAGAnswer(answer=text, confidence=0.9, sources_used=["docs/index.md"])
+
+
+def _row_count(cache: SemanticCache) -> int:
+    return cache._conn.execute("SELECT COUNT(*) FROM answers").fetchone()[0]
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    """Controllable replacement for time.time() inside the cache module"""
+    now = [1_000_000.0]
+    monkeypatch.setattr(semantic_cache_module.time, "time", lambda: now[0])
+    return now
+
+
+@pytest.fixture
+def make_cache(tmp_path):
+    caches = []
+
+    def make(embedder, **kwargs):
+        cache = SemanticCache(
+            embedder, model_name="test-model", db_path=tmp_path / "cache.db", **kwargs
+        )
+        caches.append(cache)
+        return cache
+
+    yield make
+    for cache in caches:
+        cache.close()
+
+
+def test_similar_question_above_threshold_hits(make_cache):
+    embedder = FakeEmbedder(
+        {
+            "How do I install it?": [1.0, 0.0, 0.0],
+            "How do I install this?": [0.99, 0.1, 0.0],
+        },
+        dim=3,
+    )
+    cache = make_cache(embedder, threshold=0.95)
+    cache.store("How do I install it?", NAMESPACE, _answer("pip install"))
+
+    hit = cache.lookup("How do I install this?", NAMESPACE)
+
+    assert hit is not None
+    assert hit.answer == "pip install"
+
+
+def test_question_below_threshold_misses(make_cache):
+    embedder = FakeEmbedder(
+        {
+            "How do I install it?": [1.0, 0.0, 0.0],
+            "What is a RunContext?": [0.6, 0.8, 0.0],
+        },
+        dim=3,
+    )
+    cache = make_cache(embedder, threshold=0.95)
+    cache.store("How do I install it?", NAMESPACE, _answer("pip install"))
+
+    assert cache.lookup("What is a RunContext?", NAMESPACE) is None
+
+
+def test_other_namespace_misses(make_cache):
+    cache = make_cache(FakeEmbedder())
+    cache.store("question 1", NAMESPACE, _answer("first"))
+
+    assert cache.lookup("question 1", "other/repo") is None
+
+
+def test_lookup_and_store_reuse_a_given_embedding(make_cache):
+    class CountingEmbedder(FakeEmbedder):
+        calls = 0
+
+        def encode(self, questions, normalize_embeddings=True):
+            self.calls += 1
+            return super().encode(questions, normalize_embeddings)
+
+    embedder = CountingEmbedder()
+    cache = make_cache(embedder)
+    vector = cache.embed("question 1")
+
+    assert cache.lookup("question 1", NAMESPACE, vector) is None
+    cache.store("question 1", NAMESPACE, _answer("first"), vector)
+
+    assert embedder.calls == 1
+
+
+def test_expired_answers_are_not_served(make_cache, clock):
+    cache = make_cache(FakeEmbedder(), ttl_seconds=60)
+    cache.store("question 1", NAMESPACE, _answer("first"))
+
+    clock[0] += 59
+    assert cache.lookup("question 1", NAMESPACE) is not None
+
+    clock[0] += 2
+    assert cache.lookup("question 1", NAMESPACE) is None
+
+
+def test_store_deletes_expired_answers(make_cache, clock):
+    cache = make_cache(FakeEmbedder(), ttl_seconds=60)
+    cache.store("question 1", NAMESPACE, _answer("first"))
+
+    clock[0] += 61
+    cache.store("question 2", NAMESPACE, _answer("second"))
+
+    assert _row_count(cache) == 1
+
+
+def test_store_evicts_oldest_beyond_max_entries(make_cache, clock):
+    cache = make_cache(FakeEmbedder(), max_entries=3)
+    for i in range(5):
+        clock[0] += 1
+        cache.store(f"question {i}", NAMESPACE, _answer(f"answer {i}"))
+
+    assert _row_count(cache) == 3
+    assert cache.lookup("question 0", NAMESPACE) is None
+    assert cache.lookup("question 1", NAMESPACE) is None
+    for i in range(2, 5):
+        assert cache.lookup(f"question {i}", NAMESPACE).answer == f"answer {i}"
+
+
+def test_concurrent_store_and_lookup(make_cache):
+    cache = make_cache(FakeEmbedder())
+    questions = [f"question {i}" for i in range(40)]
+
+    def store_then_lookup(question):
+        cache.store(question, NAMESPACE, _answer(question))
+        return cache.lookup(question, NAMESPACE)
+
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        results = list(executor.map(store_then_lookup, questions))
+
+    assert [result.answer for result in results] == questions
+    assert _row_count(cache) == len(questions)